@@ -1,14 +1,23 @@
-from utils import read_data
+from typing import Tuple
+from utils import read_data, PHASES
 
 
-INPUT = [x.split("\n") for x in read_data().split("\n\n")]
+def solve(raw_input: str) -> Tuple[int, int]:
+    with PHASES.phase("parse"):
+        elves = [x.split("\n") for x in raw_input.split("\n\n")]
+    with PHASES.phase("part one"):
+        totals = [sum(int(food) for food in elf) for elf in elves]
+        sorted_totals = sorted(totals, reverse=True)
+        part_one = sorted_totals[0]
+    with PHASES.phase("part two"):
+        part_two = sum(sorted_totals[:3])
+    return part_one, part_two
 
 
 def main():
-    totals = [sum(int(food) for food in elf) for elf in INPUT]
-    sorted_totals = sorted(totals, reverse=True)
-    print(f"Part one: {sorted_totals[0]}")
-    print(f"Part two: {sum(sorted_totals[:3])}")
+    part_one, part_two = solve(read_data(1))
+    print(f"Part one: {part_one}")
+    print(f"Part two: {part_two}")
 
 
 if __name__ == '__main__':
@@ -1,7 +1,6 @@
-from utils import read_data
-from typing import NamedTuple
+from utils import read_data, PHASES
+from typing import NamedTuple, Tuple
 
-INPUT = [x.split(" ") for x in read_data().splitlines()]
 ROCK = 0
 PAPER = 1
 SCISSORS = 2
@@ -55,10 +54,20 @@ class Round:
         self.part_two_score = self.part_two_sign.total_score(self.their_sign)
 
 
+def solve(raw_input: str) -> Tuple[int, int]:
+    with PHASES.phase("parse"):
+        rounds = [Round(*x.split(" ")) for x in raw_input.splitlines()]
+    with PHASES.phase("part one"):
+        part_one = sum(x.part_one_score for x in rounds)
+    with PHASES.phase("part two"):
+        part_two = sum(x.part_two_score for x in rounds)
+    return part_one, part_two
+
+
 def main():
-    rounds = [Round(*x) for x in INPUT]
-    print(f"Part one: {sum(x.part_one_score for x in rounds)}")
-    print(f"Part two: {sum(x.part_two_score for x in rounds)}")
+    part_one, part_two = solve(read_data(2))
+    print(f"Part one: {part_one}")
+    print(f"Part two: {part_two}")
 
 
 if __name__ == '__main__':
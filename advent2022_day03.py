@@ -1,4 +1,5 @@
-from utils import read_data
+from typing import Tuple
+from utils import read_data, PHASES
 
 
 def grouper(iterable, n):
@@ -6,18 +7,28 @@ def grouper(iterable, n):
     return zip(*args, strict=True)
 
 
-INPUT = read_data().split("\n")
 MAPPING = {chr(x): x - 96 for x in range(97, 123)}
 MAPPING.update({chr(x): x - 38 for x in range(65, 91)})
 
 
+def solve(raw_input: str) -> Tuple[int, int]:
+    with PHASES.phase("parse"):
+        rucksacks = raw_input.split("\n")
+    with PHASES.phase("part one"):
+        # Get the intersection of the first half of the string and the second half of the string
+        common_elements = [(set(x[:len(x) // 2]) & set(x[len(x) // 2:])).pop() for x in rucksacks]
+        part_one = sum(MAPPING[x] for x in common_elements)
+    with PHASES.phase("part two"):
+        # Get the intersection of all three strings
+        common_elements = [(set(x[0]) & set(x[1]) & set(x[2])).pop() for x in grouper(rucksacks, 3)]
+        part_two = sum(MAPPING[x] for x in common_elements)
+    return part_one, part_two
+
+
 def main():
-    # Get the intersection of the first half of the string and the second half of the string
-    common_elements = [(set(x[:len(x) // 2]) & set(x[len(x) // 2:])).pop() for x in INPUT]
-    print(f"Part one: {sum(MAPPING[x] for x in common_elements)}")
-    # Get the intersection of all three strings
-    common_elements = [(set(x[0]) & set(x[1]) & set(x[2])).pop() for x in grouper(INPUT, 3)]
-    print(f"Part two: {sum(MAPPING[x] for x in common_elements)}")
+    part_one, part_two = solve(read_data(3))
+    print(f"Part one: {part_one}")
+    print(f"Part two: {part_two}")
 
 
 if __name__ == '__main__':
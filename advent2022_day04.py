@@ -1,5 +1,5 @@
-from typing import Tuple, Set
-from utils import read_data
+from typing import Tuple
+from utils import read_data, PHASES
 import re
 
 DIGITS = re.compile(r'\d+')
@@ -21,13 +21,20 @@ def ranges_overlap(range1: range, range2: range) -> bool:
     return bool(range(max(range1.start, range2.start), min(range1[-1], range2[-1])+1))
 
 
-# INPUT = [line_to_sets(x) for x in read_data().splitlines()]
+def solve(raw_input: str) -> Tuple[int, int]:
+    with PHASES.phase("parse"):
+        pairs = [line_to_ranges(x) for x in raw_input.splitlines()]
+    with PHASES.phase("part one"):
+        part_one = len([x for x in pairs if ranges_are_subsets(*x)])
+    with PHASES.phase("part two"):
+        part_two = len([x for x in pairs if ranges_overlap(*x)])
+    return part_one, part_two
 
 
 def main():
-    INPUT = [line_to_ranges(x) for x in read_data().splitlines()]
-    print(f"Part one: {len([x for x in INPUT if ranges_are_subsets(*x)])}")
-    print(f"Part two: {len([x for x in INPUT if ranges_overlap(*x)])}")
+    part_one, part_two = solve(read_data(4))
+    print(f"Part one: {part_one}")
+    print(f"Part two: {part_two}")
 
 
 if __name__ == '__main__':
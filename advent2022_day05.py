@@ -1,12 +1,11 @@
-from typing import List, NamedTuple
+from typing import List, NamedTuple, Tuple
 from copy import deepcopy
 import string
-from utils import read_data
+from utils import read_data, PHASES
 
 import re
 
 DIGITS = re.compile(r'\d+')
-INPUT_PART1, INPUT_PART2 = read_data().split("\n\n")
 
 
 def parse_part1(asciiart: str) -> List[List[str]]:
@@ -44,17 +43,28 @@ def move_boxes(stacks: List[List[str]], fromstack: int, tostack: int, amount: in
     stacks[tostack].extend(boxes_to_move)
 
 
+def solve(raw_input: str) -> Tuple[str, str]:
+    with PHASES.phase("parse"):
+        raw_stacks, raw_procedure = raw_input.split("\n\n")
+        part1_stacks = parse_part1(raw_stacks)
+        part2_stacks = deepcopy(part1_stacks)
+        instructions = parse_part2(raw_procedure)
+    with PHASES.phase("part one"):
+        for instruction in instructions:
+            for _ in range(instruction.amount):
+                move_boxes(part1_stacks, instruction.fromstack, instruction.tostack, 1)
+        part_one = ''.join(x[-1] for x in part1_stacks[1:] if len(x) > 0)
+    with PHASES.phase("part two"):
+        for instruction in instructions:
+            move_boxes(part2_stacks, instruction.fromstack, instruction.tostack, instruction.amount)
+        part_two = ''.join(x[-1] for x in part2_stacks[1:] if len(x) > 0)
+    return part_one, part_two
+
+
 def main():
-    part1_stacks = parse_part1(INPUT_PART1)
-    part2_stacks = deepcopy(part1_stacks)
-    instructions = parse_part2(INPUT_PART2)
-    for instruction in instructions:
-        for _ in range(instruction.amount):
-            move_boxes(part1_stacks, instruction.fromstack, instruction.tostack, 1)
-    print(f"Part one: {''.join(x[-1] for x in part1_stacks[1:] if len(x) > 0)}")
-    for instruction in instructions:
-        move_boxes(part2_stacks, instruction.fromstack, instruction.tostack, instruction.amount)
-    print(f"Part two: {''.join(x[-1] for x in part2_stacks[1:] if len(x) > 0)}")
+    part_one, part_two = solve(read_data(5))
+    print(f"Part one: {part_one}")
+    print(f"Part two: {part_two}")
 
 
 if __name__ == '__main__':
@@ -1,9 +1,10 @@
-from utils import read_data
-from more_itertools import windowed
+from typing import Tuple
+from utils import read_data, PHASES
 from collections import Counter
 
 
 def find_marker(signal: str, window_size: int = 4) -> int:
+    from more_itertools import windowed
     for i, window in enumerate(windowed(signal, window_size)):
         # Get the most common letter (element 0) and check its count (name, count)
         if Counter(window).most_common()[0][1] == 1:
@@ -11,9 +12,19 @@ def find_marker(signal: str, window_size: int = 4) -> int:
     raise Exception("Marker not found!")
 
 
+def solve(raw_input: str) -> Tuple[int, int]:
+    # The markers are found straight from the raw text, so there's no parse phase
+    with PHASES.phase("part one"):
+        part_one = find_marker(raw_input, 4)
+    with PHASES.phase("part two"):
+        part_two = find_marker(raw_input, 14)
+    return part_one, part_two
+
+
 def main():
-    print(f"Part one: {find_marker(read_data(), 4)}")
-    print(f"Part two: {find_marker(read_data(), 14)}")
+    part_one, part_two = solve(read_data(6))
+    print(f"Part one: {part_one}")
+    print(f"Part two: {part_two}")
 
 
 if __name__ == '__main__':
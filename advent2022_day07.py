@@ -1,6 +1,6 @@
 from typing import Dict, Tuple, List, Iterable
 from pathlib import Path
-from utils import read_data
+from utils import read_data, PHASES
 
 
 def affected_folders(node: Path) -> Iterable[Path]:
@@ -47,13 +47,23 @@ def parse_input(full_input: str) -> Dict[Path, int]:
     return sizes
 
 
+def solve(raw_input: str) -> Tuple[int, int]:
+    with PHASES.phase("parse"):
+        size_dict = parse_input(raw_input)
+    with PHASES.phase("part one"):
+        part_one = sum(x for x in size_dict.values() if x < 100000)
+    with PHASES.phase("part two"):
+        free_space = 70000000 - size_dict[Path("/")]
+        space_needed = 30000000
+        threshold_to_free = space_needed - free_space
+        part_two = min(x for x in size_dict.values() if x > threshold_to_free)
+    return part_one, part_two
+
+
 def main():
-    size_dict = parse_input(read_data())
-    print(f"Part one: {sum(x for x in size_dict.values() if x < 100000)}")
-    free_space = 70000000 - size_dict[Path("/")]
-    space_needed = 30000000
-    threshold_to_free = space_needed - free_space
-    print(f"Part two: {min(x for x in size_dict.values() if x > threshold_to_free)}")
+    part_one, part_two = solve(read_data(7))
+    print(f"Part one: {part_one}")
+    print(f"Part two: {part_two}")
 
 
 if __name__ == '__main__':
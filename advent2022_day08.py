@@ -1,55 +1,61 @@
-from utils import read_data, BaseCoord as Coord, CARDINAL_NEIGHBORS_2D
-from typing import Dict
-from math import prod
+from __future__ import annotations
+from utils import read_data, Grid, PHASES, np
+from typing import Iterator, Tuple
 
 
 class Forest:
-    def __init__(self, grid: Dict[Coord, int]):
+    def __init__(self, grid: Grid):
         self.grid = grid
 
-    def coords_to_edge(self, start: Coord, step: Coord):
-        current_coord = start + step
-        while current_coord in self.grid:
-            yield current_coord
-            current_coord = current_coord + step
-
-    def tree_is_visible_from_direction(self, coord: Coord, step: Coord) -> bool:
-        tree_height = self.grid[coord]
-        return all(self.grid[c] < tree_height for c in self.coords_to_edge(coord, step))
-
-    def tree_is_visible(self, coord: Coord) -> bool:
-        return any(self.tree_is_visible_from_direction(coord, step) for step in CARDINAL_NEIGHBORS_2D)
+    def views(self) -> Iterator[Tuple[int, np.ndarray]]:
+        # The forest turned so each direction in turn becomes "looking left", along with how far it was turned
+        for turns in range(4):
+            yield turns, np.rot90(self.grid.cells, turns)
 
     def count_visible_trees(self) -> int:
-        return sum(self.tree_is_visible(x) for x in self.grid)
+        visible = np.zeros(self.grid.cells.shape, dtype=bool)
+        for turns, trees in self.views():
+            # The tallest tree anywhere to the left of each tree, or -1 at the edge
+            tallest = np.full_like(trees, -1)
+            tallest[:, 1:] = np.maximum.accumulate(trees, axis=1)[:, :-1]
+            visible |= np.rot90(trees > tallest, -turns)
+        return int(visible.sum())
 
-    def viewing_distance_in_direction(self, coord: Coord, step: Coord) -> int:
-        trees_visible = 0
-        my_height = self.grid[coord]
-        for trees_visible, to_check in enumerate(self.coords_to_edge(coord, step), start=1):
-            if self.grid[to_check] >= my_height:
-                break
-        return trees_visible
+    def best_viewing_score(self) -> int:
+        scores = np.ones(self.grid.cells.shape, dtype=np.int64)
+        heights = np.arange(10)[:, None]
+        for turns, trees in self.views():
+            rows = np.arange(trees.shape[0])
+            distance = np.zeros(trees.shape, dtype=np.int64)
+            # last[h, row] is the column of the nearest tree so far that's at least h tall, or 0 (the edge) if none
+            last = np.zeros((10, trees.shape[0]), dtype=np.int64)
+            for x in range(trees.shape[1]):
+                column = trees[:, x]
+                # The tree that blocks the view still counts as seen
+                distance[:, x] = x - last[column, rows]
+                last[heights <= column] = x
+            scores *= np.rot90(distance, -turns)
+        return int(scores.max())
 
-    def viewing_score(self, coord: Coord):
-        return prod(self.viewing_distance_in_direction(coord, x) for x in CARDINAL_NEIGHBORS_2D)
 
-    def best_viewing_score(self):
-        return max(self.viewing_score(x) for x in self.grid)
+def parse_input(raw_input: str) -> Grid:
+    return Grid.from_text(raw_input, {str(x): x for x in range(10)}, fill=-1, dtype=np.int8)
 
 
-def parse_input(raw_input: str) -> Dict[Coord, int]:
-    tree_cloud = {}
-    for y, line in enumerate(raw_input.splitlines()):
-        for x, height in enumerate(line):
-            tree_cloud[Coord(x=x, y=y)] = int(height)
-    return tree_cloud
+def solve(raw_input: str) -> Tuple[int, int]:
+    with PHASES.phase("parse"):
+        trees = Forest(parse_input(raw_input))
+    with PHASES.phase("part one"):
+        part_one = trees.count_visible_trees()
+    with PHASES.phase("part two"):
+        part_two = trees.best_viewing_score()
+    return part_one, part_two
 
 
 def main():
-    trees = Forest(parse_input(read_data()))
-    print(f"Part one: {trees.count_visible_trees()}")
-    print(f"Part two: {trees.best_viewing_score()}")
+    part_one, part_two = solve(read_data(8))
+    print(f"Part one: {part_one}")
+    print(f"Part two: {part_two}")
 
 
 if __name__ == '__main__':
@@ -1,5 +1,5 @@
-from utils import read_data, BaseCoord
-from typing import List
+from utils import read_data, memoize, BaseCoord, PHASES
+from typing import List, Optional, Tuple
 
 
 class Coord(BaseCoord):
@@ -14,8 +14,14 @@ class Coord(BaseCoord):
         return max(abs(self.x), abs(self.y)) <= 1
 
     def catch_up(self, other: 'Coord') -> 'Coord':
-        diff = other - self
-        return self if diff.in_range() else self + diff.normalized()
+        step = step_towards(other - self)
+        return self if step is None else self + step
+
+
+# A knot is never more than 2 away from the one ahead of it, so there are only 25 diffs and they repeat constantly
+@memoize(maxsize=None)
+def step_towards(diff: Coord) -> Optional[Coord]:
+    return None if diff.in_range() else diff.normalized()
 
 
 def move_knots(knots: List[Coord], direction: str) -> List[Coord]:
@@ -44,9 +50,19 @@ DIRECTIONS = {
 }
 
 
+def solve(raw_input: str) -> Tuple[int, int]:
+    # Each part reads the moves as it goes, so parsing is counted in with them
+    with PHASES.phase("part one"):
+        part_one = handle_input(raw_input, length=2)
+    with PHASES.phase("part two"):
+        part_two = handle_input(raw_input, length=10)
+    return part_one, part_two
+
+
 def main():
-    print(f"Part one: {handle_input(read_data(), length=2)}")
-    print(f"Part two: {handle_input(read_data(), length=10)}")
+    part_one, part_two = solve(read_data(9))
+    print(f"Part one: {part_one}")
+    print(f"Part two: {part_two}")
 
 
 if __name__ == '__main__':
@@ -1,5 +1,5 @@
 from typing import Tuple
-from utils import read_data
+from utils import read_data, PHASES
 
 
 # Taken from https://stackoverflow.com/a/2657733
@@ -55,17 +55,27 @@ def execute_instruction(x: int, instruction: str, part_two=False) -> Tuple[int,
         raise Exception(f"Unknown instruction {instruction}!")
 
 
+def solve(raw_input: str) -> Tuple[int, str]:
+    with PHASES.phase("parse"):
+        # Initialize the 0th item to the starting value, since cycle starts on 1
+        x_values = [1]
+        x = 1
+        for line in raw_input.splitlines():
+            new_x, cycles_taken = execute_instruction(x, line)
+            x_values += [x] * cycles_taken
+            x = new_x
+    with PHASES.phase("part one"):
+        part_one = sum(x_values[v] * v for v in range(20, 221, 40))
+    with PHASES.phase("part two"):
+        pixels = ''.join("█" if sprite_visible(i, x) else " " for i, x in enumerate(x_values[1:]))
+        part_two = ocr(insert_newlines(pixels))
+    return part_one, part_two
+
+
 def main():
-    # Initialize the 0th item to the starting value, since cycle starts on 1
-    x_values = [1]
-    x = 1
-    for line in read_data().splitlines():
-        new_x, cycles_taken = execute_instruction(x, line)
-        x_values += [x] * cycles_taken
-        x = new_x
-    print(f"Part one: {sum(x_values[v] * v for v in range(20, 221, 40))}")
-    output_str = insert_newlines(''.join("█" if sprite_visible(i, x) else " " for i, x in enumerate(x_values[1:])))
-    print(f"Part two: {ocr(output_str)}")
+    part_one, part_two = solve(read_data(10))
+    print(f"Part one: {part_one}")
+    print(f"Part two: {part_two}")
 
 
 if __name__ == '__main__':
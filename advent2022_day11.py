@@ -1,8 +1,8 @@
-from typing import List, Union
+from typing import List, Union, Tuple
 from math import prod
 import re
 
-from utils import read_data
+from utils import read_data, find_cycle, PHASES
 
 PARSE_REGEX = re.compile(r'Monkey (?P<monkey_num>\d):\n'
                          r'  Starting items: (?P<items>.*$)\n'
@@ -34,35 +34,82 @@ class Monkey:
         else:
             raise Exception(f"Unknown operator f{self.op}")
 
+    def inspect(self, item: int) -> Tuple[int, int]:
+        """Returns who the item gets thrown to, and its new worry level."""
+        worry_level = self.apply_op(item)
+        if self.lcm:
+            worry_level = worry_level % self.lcm
+        else:
+            worry_level = worry_level // 3
+        return self.true_throw if worry_level % self.test_div == 0 else self.false_throw, worry_level
+
     def handle_items(self, monkeys: List['Monkey']):
         for item in self.items:
             self.inspection_counter += 1
-            worry_level = self.apply_op(item)
-            if self.lcm:
-                worry_level = worry_level % self.lcm
-            else:
-                worry_level = worry_level // 3
-            throw_to = self.true_throw if worry_level % self.test_div == 0 else self.false_throw
+            throw_to, worry_level = self.inspect(item)
             monkeys[throw_to].items.append(worry_level)
         self.items = []
 
 
-def main():
-    monkeys = [Monkey(x) for x in read_data().split("\n\n")]
-    for _ in range(20):
-        for monkey in monkeys:
-            monkey.handle_items(monkeys)
-    most_active_monkeys = sorted([x.inspection_counter for x in monkeys], reverse=True)
-    print(f"Part one: {most_active_monkeys[0] * most_active_monkeys[1]}")
-    monkeys = [Monkey(x) for x in read_data().split("\n\n")]
-    lcm = prod(x.test_div for x in monkeys)
+# An item's monkey, its worry level, and how many times each monkey has inspected it
+ItemState = Tuple[int, int, Tuple[int, ...]]
+
+
+def item_round(monkeys: List[Monkey], state: ItemState) -> ItemState:
+    monkey_num, worry_level, inspections = state
+    counts = list(inspections)
+    while True:
+        counts[monkey_num] += 1
+        throw_to, worry_level = monkeys[monkey_num].inspect(worry_level)
+        # Monkeys take turns in order, so an item thrown to a later monkey gets handled again this round
+        if throw_to < monkey_num:
+            return throw_to, worry_level, tuple(counts)
+        monkey_num = throw_to
+
+
+def inspections_after(monkeys: List[Monkey], rounds: int) -> List[int]:
+    """Per-monkey inspection counts after some number of rounds, once every monkey has its lcm set.
+
+    With worry levels kept mod the lcm, items no longer affect each other, and each one loops within a few hundred
+    rounds, so it's quicker to find each item's loop and fast forward it than to run every round.
+    """
+    totals = [0] * len(monkeys)
     for monkey in monkeys:
-        monkey.lcm = lcm
-    for i in range(10000):
-        for monkey in monkeys:
-            monkey.handle_items(monkeys)
-    most_active_monkeys = sorted([x.inspection_counter for x in monkeys], reverse=True)
-    print(f"Part two: {most_active_monkeys[0] * most_active_monkeys[1]}")
+        for item in monkey.items:
+            cycle = find_cycle(
+                (monkey.monkeynum, item, (0,) * len(monkeys)),
+                step=lambda state: item_round(monkeys, state),
+                key=lambda state: state[:2],
+                value=lambda state: state[2],
+            )
+            totals = [x + y for x, y in zip(totals, cycle.value_at(rounds))]
+    return totals
+
+
+def solve(raw_input: str) -> Tuple[int, int]:
+    with PHASES.phase("parse"):
+        monkeys = [Monkey(x) for x in raw_input.split("\n\n")]
+        # Part two needs its own fresh set, since part one moves the items around
+        part_two_monkeys = [Monkey(x) for x in raw_input.split("\n\n")]
+    with PHASES.phase("part one"):
+        for _ in range(20):
+            for monkey in monkeys:
+                monkey.handle_items(monkeys)
+        most_active_monkeys = sorted([x.inspection_counter for x in monkeys], reverse=True)
+        part_one = most_active_monkeys[0] * most_active_monkeys[1]
+    with PHASES.phase("part two"):
+        lcm = prod(x.test_div for x in part_two_monkeys)
+        for monkey in part_two_monkeys:
+            monkey.lcm = lcm
+        most_active_monkeys = sorted(inspections_after(part_two_monkeys, 10000), reverse=True)
+        part_two = most_active_monkeys[0] * most_active_monkeys[1]
+    return part_one, part_two
+
+
+def main():
+    part_one, part_two = solve(read_data(11))
+    print(f"Part one: {part_one}")
+    print(f"Part two: {part_two}")
 
 
 if __name__ == '__main__':
@@ -1,6 +1,13 @@
-from collections import deque, defaultdict
-from typing import Tuple, Deque, DefaultDict, Iterable
-from utils import read_data, BaseCoord as Coord
+from collections import defaultdict
+from typing import Tuple, DefaultDict, Iterable
+from utils import read_data, BaseCoord as Coord, PHASES
+from cache import parse_cache
+from search import bfs
+
+
+def unreachable() -> int:
+    # A plain function rather than a lambda, so the heatmap can be pickled
+    return 99999
 
 
 class Heightmap:
@@ -26,23 +33,34 @@ class Heightmap:
         return tuple(x for x in neighbors if self.points[x] >= (self.points[point] - 1))
 
     def generate_heatmap(self, start_coord: Coord) -> DefaultDict[Coord, int]:
-        heatmap: DefaultDict[Coord, int] = defaultdict(lambda: 99999)
-        to_evaluate: Deque[Tuple[Coord, int]] = deque([(start_coord, 0)])
-        while len(to_evaluate) > 0:
-            loc, score = to_evaluate.popleft()
-            if score < heatmap[loc]:
-                heatmap[loc] = score
-                to_evaluate.extend((x, score + 1) for x in self.valid_dirs[loc])
+        heatmap: DefaultDict[Coord, int] = defaultdict(unreachable)
+        heatmap.update(bfs([start_coord], self.valid_dirs.__getitem__, metrics="day12.generate_heatmap").distances)
         return heatmap
 
     def all_of_height(self, height: str) -> Iterable:
         return (k for k, v in self.points.items() if v == ord(height))
 
 
+@parse_cache
+def load_heightmap(raw: str) -> Heightmap:
+    return Heightmap(raw)
+
+
+def solve(raw_input: str) -> Tuple[int, int]:
+    # The heatmap is built as part of loading, so the search itself is counted as parsing here
+    with PHASES.phase("parse"):
+        hmap = load_heightmap(raw_input)
+    with PHASES.phase("part one"):
+        part_one = hmap.heatmap[hmap.start]
+    with PHASES.phase("part two"):
+        part_two = min(hmap.heatmap[x] for x in hmap.all_of_height('a'))
+    return part_one, part_two
+
+
 def main():
-    hmap = Heightmap(read_data())
-    print(f"Part one: {hmap.heatmap[hmap.start]}")
-    print(f"Part two: {min(hmap.heatmap[x] for x in hmap.all_of_height('a'))}")
+    part_one, part_two = solve(read_data(12))
+    print(f"Part one: {part_one}")
+    print(f"Part two: {part_two}")
 
 
 if __name__ == "__main__":
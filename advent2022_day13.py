@@ -1,7 +1,6 @@
-from typing import List, Union
-from utils import read_data
+from typing import List, Union, Tuple
+from utils import read_data, PHASES
 from itertools import zip_longest
-from more_itertools import chunked
 import json
 
 
@@ -36,11 +35,22 @@ class Packet:
         raise Exception("Shouldn't reach this")
 
 
+def solve(raw_input: str) -> Tuple[int, int]:
+    from more_itertools import chunked
+    with PHASES.phase("parse"):
+        INPUT = [Packet(json.loads(x)) for x in raw_input.splitlines() if x]
+    with PHASES.phase("part one"):
+        part_one = sum(i + 1 for i, x in enumerate(chunked(INPUT, 2)) if x[0] < x[1])
+    with PHASES.phase("part two"):
+        part_two_data = sorted(INPUT + [Packet([[2]])] + [Packet([[6]])])
+        part_two = (part_two_data.index(Packet([[2]])) + 1) * (part_two_data.index(Packet([[6]])) + 1)
+    return part_one, part_two
+
+
 def main():
-    INPUT = [Packet(json.loads(x)) for x in read_data().splitlines() if x]
-    print(f"Part one: {sum(i + 1 for i, x in enumerate(chunked(INPUT, 2)) if x[0] < x[1])}")
-    part_two_data = sorted(INPUT + [Packet([[2]])] + [Packet([[6]])])
-    print(f"Part two: {(part_two_data.index(Packet([[2]])) + 1) * (part_two_data.index(Packet([[6]])) + 1)}")
+    part_one, part_two = solve(read_data(13))
+    print(f"Part one: {part_one}")
+    print(f"Part two: {part_two}")
 
 
 if __name__ == '__main__':
@@ -1,6 +1,5 @@
-from typing import List, Set, Iterator, Optional
-from more_itertools import windowed
-from utils import read_data, BaseCoord
+from typing import List, Iterator, Optional, Tuple
+from utils import read_data, BaseCoord, CoordSet, pack, PHASES
 
 
 class Coord(BaseCoord):
@@ -20,8 +19,9 @@ class Coord(BaseCoord):
         return Coord(x=int(raw_x), y=int(raw_y))
 
 
-def parse_data(lines: List[str]) -> Set[Coord]:
-    walls = set()
+def parse_data(lines: List[str]) -> CoordSet:
+    from more_itertools import windowed
+    walls = CoordSet()
     # Filter out empty lines
     for line in (x for x in lines if x):
         for first, second in windowed(line.split(" -> "), n=2):
@@ -29,41 +29,42 @@ def parse_data(lines: List[str]) -> Set[Coord]:
     return walls
 
 
+# Where a grain tries to go next, in order, as packed offsets
+FALL_STEPS = tuple(pack(x) for x in (Coord(x=0, y=1), Coord(x=-1, y=1), Coord(x=1, y=1)))
+
+
 class SandSim:
-    def __init__(self, walls: Set[Coord], start: Coord = Coord(x=500, y=0)):
+    def __init__(self, walls: CoordSet, start: Coord = Coord(x=500, y=0)):
         self.original_walls = walls.copy()
         self.walls = walls.copy()
-        self.sand = set()
+        self.sand = CoordSet()
         self.occlusion = walls.copy()
         self.start = start
-        self.start_cache = [start]
-        self.min_x, self.max_x = min(point.x for point in self.walls) - 1, max(point.x for point in self.walls) + 1
+        self.start_key = pack(start)
+        self.start_cache = [self.start_key]
+        wall_coords = list(self.walls)
+        self.min_x, self.max_x = min(point.x for point in wall_coords) - 1, max(point.x for point in wall_coords) + 1
         # We want our min_y to include the start
-        self.min_y, self.max_y = self.start.y, max(point.y for point in self.walls)
+        self.min_y, self.max_y = self.start.y, max(point.y for point in wall_coords)
 
-    def add_sand_grain(self, floor: bool = False) -> Optional[Coord]:
+    def add_sand_grain(self, floor: bool = False) -> Optional[int]:
+        occlusion = self.occlusion.keys
         # If we're full of sand up to the start, no more can be added
-        if self.start in self.occlusion:
+        if self.start_key in occlusion:
             return None
         current_point = self.start_cache[-1]
-        while current_point.y <= self.max_y:
-            new_point = current_point + Coord(x=0, y=1)
-            if new_point not in self.occlusion:
-                self.start_cache.append(new_point)
-                current_point = new_point
-                continue
-            new_point = current_point + Coord(x=-1, y=1)
-            if new_point not in self.occlusion:
-                self.start_cache.append(new_point)
-                current_point = new_point
-                continue
-            new_point = current_point + Coord(x=1, y=1)
-            if new_point not in self.occlusion:
-                self.start_cache.append(new_point)
-                current_point = new_point
-                continue
-            # If we've reached this point, the sand is blocked and we need to add it to our maps
-            return current_point
+        # Every step in the cache is one row further down than the one before it
+        depth = self.start.y + len(self.start_cache) - 1
+        while depth <= self.max_y:
+            for step in FALL_STEPS:
+                if current_point + step not in occlusion:
+                    current_point += step
+                    self.start_cache.append(current_point)
+                    depth += 1
+                    break
+            else:
+                # If we've reached this point, the sand is blocked and we need to add it to our maps
+                return current_point
         # If we've reached this point, we're either at the floor or are falling off the bottom
         if floor:
             return current_point
@@ -72,20 +73,31 @@ class SandSim:
 
     def run_sim(self, floor: bool = False) -> int:
         self.walls = self.original_walls.copy()
-        self.sand = set()
+        self.sand = CoordSet()
         self.occlusion = self.walls.copy()
-        self.start_cache = [self.start]
-        while new_grain := self.add_sand_grain(floor=floor):
+        self.start_cache = [self.start_key]
+        # Grains are packed coords, so (0, 0) would be falsy
+        while (new_grain := self.add_sand_grain(floor=floor)) is not None:
             self.start_cache.pop()
-            self.sand.add(new_grain)
-            self.occlusion.add(new_grain)
+            self.sand.keys.add(new_grain)
+            self.occlusion.keys.add(new_grain)
         return len(self.sand)
 
 
+def solve(raw_input: str) -> Tuple[int, int]:
+    with PHASES.phase("parse"):
+        sand_sim = SandSim(parse_data(raw_input.splitlines()))
+    with PHASES.phase("part one"):
+        part_one = sand_sim.run_sim()
+    with PHASES.phase("part two"):
+        part_two = sand_sim.run_sim(floor=True)
+    return part_one, part_two
+
+
 def main():
-    sand_sim = SandSim(parse_data(read_data().splitlines()))
-    print(f"Part one: {sand_sim.run_sim()}")
-    print(f"Part two: {sand_sim.run_sim(floor=True)}")
+    part_one, part_two = solve(read_data(14))
+    print(f"Part one: {part_one}")
+    print(f"Part two: {part_two}")
 
 
 if __name__ == '__main__':
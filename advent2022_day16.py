@@ -1,7 +1,8 @@
-from typing import Dict, List, Tuple, NamedTuple, FrozenSet, Deque
-from collections import defaultdict, deque
+from typing import Dict, List, Tuple, NamedTuple, FrozenSet, Iterator
 from itertools import combinations
-from utils import read_data
+from utils import read_data, METRICS, PHASES
+from cache import parse_cache
+from search import bfs, explore
 import re
 
 VALVE_REGEX = re.compile(
@@ -11,18 +12,10 @@ PathMapping = Dict[str, Dict[str, int]]
 
 
 def find_shortest_paths(node: str, connections: Dict[str, List[str]]) -> Dict[str, int]:
-    shortest_paths = defaultdict(lambda: 99999)
-    work_queue = [(node, 0)]
-    while len(work_queue) > 0:
-        current, cost = work_queue.pop()
-        if shortest_paths[current] <= cost:
-            continue
-        if cost > 0:
-            shortest_paths[current] = cost
-        work_queue.extend([(x, cost + 1) for x in connections[current]])
-    return dict(shortest_paths)
+    return bfs([node], connections.__getitem__).distances
 
 
+@parse_cache
 def build_graph(raw_input: str) -> Tuple[Dict[str, int], PathMapping]:
     flow_rates: Dict[str, int] = {}
     connections: Dict[str, List[str]] = {}
@@ -36,8 +29,9 @@ def build_graph(raw_input: str) -> Tuple[Dict[str, int], PathMapping]:
         connections[parsed["name"]] = parsed["tunnels"].split(", ")
 
     # Precalculate shortest paths for non-null nodes
-    for node in connections:
-        shortest_paths[node] = {k: v for k, v in find_shortest_paths(node, connections).items() if k in flow_rates}
+    with METRICS.timer("day16.build_graph.shortest_paths"):
+        for node in connections:
+            shortest_paths[node] = {k: v for k, v in find_shortest_paths(node, connections).items() if k in flow_rates}
 
     return flow_rates, shortest_paths
 
@@ -52,38 +46,50 @@ class State(NamedTuple):
 def max_flow(
     flow_rates: Dict[str, int], shortest_paths: PathMapping, time_left: int = 30
 ) -> Dict[FrozenSet[str], int]:
-    initial_state = State(time_left, score=0, current_loc="AA", valves_opened=frozenset())
-    best_states: Dict[FrozenSet[str], int] = {}
-    work_queue: Deque[State] = deque([initial_state])
-    while len(work_queue) > 0:
-        state = work_queue.pop()
-        if state.score > best_states.get(state.valves_opened, 0):
-            best_states[state.valves_opened] = state.score
+    def next_states(state: State) -> Iterator[State]:
         for new_loc in flow_rates:
             if new_loc in state.valves_opened:
                 continue
             new_time = state.time_left - (shortest_paths[state.current_loc][new_loc] + 1)
             if new_time <= 0:
                 continue
-            # This is a valid path, add it to the queue
-            new_state = State(
+            # This is a valid path, go down it
+            yield State(
                 time_left=new_time,
                 score=state.score + (new_time * flow_rates[new_loc]),
                 current_loc=new_loc,
                 valves_opened=state.valves_opened | {new_loc},
             )
-            work_queue.append(new_state)
+
+    initial_state = State(time_left, score=0, current_loc="AA", valves_opened=frozenset())
+    best_states: Dict[FrozenSet[str], int] = {}
+    # Every path is its own state (the score depends on the order valves were opened in), so there's nothing to dedupe
+    for state in explore([initial_state], next_states, key=None, metrics="day16.max_flow"):
+        if state.score > best_states.get(state.valves_opened, 0):
+            best_states[state.valves_opened] = state.score
     return best_states
 
 
+def solve(raw_input: str) -> Tuple[int, int]:
+    with PHASES.phase("parse"):
+        flow_rates, shortest_paths = build_graph(raw_input)
+    with PHASES.phase("part one"):
+        solutions = max_flow(flow_rates, shortest_paths, time_left=30)
+        part_one = max(solutions.values())
+    with PHASES.phase("part two"):
+        solutions = max_flow(flow_rates, shortest_paths, time_left=26)
+        # Find all non-overlapping pairs in the solutions and add their total point values
+        joint_solutions = [
+            solutions[x[0]] + solutions[x[1]] for x in combinations(solutions, 2) if len(x[0] & x[1]) == 0
+        ]
+        part_two = max(joint_solutions)
+    return part_one, part_two
+
+
 def main():
-    flow_rates, shortest_paths = build_graph(read_data())
-    solutions = max_flow(flow_rates, shortest_paths, time_left=30)
-    print(f"Part one: {max(solutions.values())}")
-    solutions = max_flow(flow_rates, shortest_paths, time_left=26)
-    # Find all non-overlapping pairs in the solutions and add their total point values
-    joint_solutions = [solutions[x[0]] + solutions[x[1]] for x in combinations(solutions, 2) if len(x[0] & x[1]) == 0]
-    print(f"Part two: {max(joint_solutions)}")
+    part_one, part_two = solve(read_data(16))
+    print(f"Part one: {part_one}")
+    print(f"Part two: {part_two}")
 
 
 if __name__ == "__main__":
@@ -1,11 +1,23 @@
-from typing import Iterator, NamedTuple, Set, Tuple, Optional, Type, Dict, List
-from typing_extensions import Self
+from __future__ import annotations
+from typing import Iterator, NamedTuple, Tuple, Optional, Type, FrozenSet, TYPE_CHECKING
 
-from utils import read_data, BaseCoord as Coord
+from utils import read_data, BaseCoord as Coord, CoordSet, Cycle, COORD_STRIDE, pack, PHASES
+import utils
+
+if TYPE_CHECKING:
+    from typing_extensions import Self
 
 
 JET_DIRECTIONS = {"<": Coord(x=-1, y=0), ">": Coord(x=1, y=0)}
 
+# How far below the top of the tower surface() looks. Rocks are at most 4 tall and settle within a few rows of the
+# top, so air any deeper than this is treated as filled in. Without a cap, a column that never gets filled (like the
+# right edge when every jet pushes left) makes the surface grow with the tower, and no state would ever repeat
+SURFACE_DEPTH = 32
+
+# How many passes through the jet pattern (times the five rocks) to look for a cycle in before giving up
+MAX_CYCLE_PASSES = 10
+
 
 class BaseShape(NamedTuple):
     origin: Coord
@@ -19,10 +31,29 @@ class BaseShape(NamedTuple):
     def move(self, offset: Coord) -> Self:
         return self.__class__(origin=self.origin + offset)
 
+    def fits(self, board: CoordSet) -> bool:
+        # Checking packed points straight against the board's keys, since this runs for every move of every rock
+        origin = pack(self.origin)
+        return (
+            0 <= self.origin.x and self.origin.x + self._width() <= 7 and self.origin.y + self._height() <= 0
+            and not any(origin + x in board.keys for x in self._point_keys())
+        )
+
+    @classmethod
+    def _point_keys(cls) -> Tuple[int, ...]:
+        # The shape's points relative to its origin, packed once per shape
+        if "_keys" not in cls.__dict__:
+            cls._keys = tuple(pack(x) for x in cls(origin=Coord(x=0, y=0)).points())
+        return cls._keys
+
     @staticmethod
     def _height() -> int:
         return 1
 
+    @staticmethod
+    def _width() -> int:
+        return 4
+
     @classmethod
     def spawn_new(cls, board_height: int) -> 'BaseShape':
         return cls(origin=Coord(x=2, y=board_height-3-cls._height()))
@@ -51,6 +82,10 @@ class Plus(BaseShape):
     def _height() -> int:
         return 3
 
+    @staticmethod
+    def _width() -> int:
+        return 3
+
 
 class BackwardsL(BaseShape):
     def points(self) -> Iterator[Coord]:
@@ -66,6 +101,10 @@ class BackwardsL(BaseShape):
     def _height() -> int:
         return 3
 
+    @staticmethod
+    def _width() -> int:
+        return 3
+
 
 class VerticalLine(BaseShape):
     def points(self) -> Iterator[Coord]:
@@ -79,6 +118,10 @@ class VerticalLine(BaseShape):
     def _height() -> int:
         return 4
 
+    @staticmethod
+    def _width() -> int:
+        return 1
+
 
 class Square(BaseShape):
     def points(self) -> Iterator[Coord]:
@@ -93,10 +136,9 @@ class Square(BaseShape):
     def _height() -> int:
         return 2
 
-
-def jets(input_str: str) -> Iterator[Coord]:
-    while True:
-        yield from (JET_DIRECTIONS[x] for x in input_str)
+    @staticmethod
+    def _width() -> int:
+        return 2
 
 
 def shapes() -> Iterator[Type[BaseShape]]:
@@ -105,20 +147,20 @@ def shapes() -> Iterator[Type[BaseShape]]:
 
 
 def drop_shape(
-    board: Set[Coord], board_height: int, shape: Type[BaseShape], jet_directions: Iterator[Coord]
-) -> Tuple[Set[Coord], int]:
+    board: CoordSet, board_height: int, shape: Type[BaseShape], jet_directions: Iterator[Coord]
+) -> Tuple[CoordSet, int]:
     # Create the shape
     active_shape = shape.spawn_new(board_height)
     while True:
         # Apply the jet
         next_dir = next(jet_directions)
         moved_shape = active_shape.move(next_dir)
-        if all(x.x in range(7) and x not in board for x in moved_shape.points()):
+        if moved_shape.fits(board):
             active_shape = moved_shape
 
         # Attempt to move down
         moved_shape = active_shape.move(Coord(x=0, y=1))
-        if any(x.y >= 0 or x in board for x in moved_shape.points()):
+        if not moved_shape.fits(board):
             board.update(active_shape.points())
             new_height = min(active_shape.origin.y, board_height)
             return board, new_height
@@ -126,7 +168,7 @@ def drop_shape(
             active_shape = moved_shape
 
 
-def print_board(board: Set[Coord], board_height: int, active_shape: Optional[BaseShape] = None):
+def print_board(board: CoordSet, board_height: int, active_shape: Optional[BaseShape] = None):
     active_set = set(active_shape.points()) if active_shape else set()
     for y in range(board_height, 1):
         for x in range(7):
@@ -136,37 +178,77 @@ def print_board(board: Set[Coord], board_height: int, active_shape: Optional[Bas
     print("-------")
 
 
-def find_cycle(raw_jets: str) -> Tuple[List[int], int, int]:
-    board = set()
-    board_height = 0
-    jet_iter = jets(raw_jets)
-    shapes_iter = shapes()
-    diffs: List[int] = []
-    seen_diffsets: Dict[Tuple[int], Tuple[int, int]] = {}
-    for i in range(1, 1000000000001):
-        old_height = board_height
-        board, board_height = drop_shape(board, board_height, next(shapes_iter), jet_iter)
-        diffs.append(abs(board_height - old_height))
-        # Arbitrarily picked 25 as the length of diffs to use to find the cycle after 20 was too short
-        diffset = tuple(diffs[-25:])
-        if diffset in seen_diffsets:
-            offset, offset_height = seen_diffsets[diffset]
-            return list(diffs)[offset-i:], offset, offset_height
-        else:
-            seen_diffsets[diffset] = (i, abs(board_height))
-
-
-def run_sim_to_i(i: int, cycle: List[int], offset: int, offset_height: int) -> int:
-    assert i > offset
-    num_cycles = (i - offset) // len(cycle)
-    leftover = (i - offset) % len(cycle)
-    return offset_height + (num_cycles * sum(cycle)) + sum(cycle[:leftover])
+class Tower:
+    def __init__(self, raw_jets: str):
+        self.jets = [JET_DIRECTIONS[x] for x in raw_jets]
+        self.jet_index = 0
+        self.shapes = shapes()
+        self.next_shape = next(self.shapes)
+        self.board = CoordSet()
+        # The y of the highest rock, which goes negative as the tower grows upward
+        self.board_height = 0
+
+    def _next_jet(self) -> Iterator[Coord]:
+        while True:
+            yield self.jets[self.jet_index]
+            self.jet_index = (self.jet_index + 1) % len(self.jets)
+
+    def drop(self) -> 'Tower':
+        self.board, self.board_height = drop_shape(self.board, self.board_height, self.next_shape, self._next_jet())
+        # The generator stops at the jet the rock settled on, which hasn't been moved past yet
+        self.jet_index = (self.jet_index + 1) % len(self.jets)
+        self.next_shape = next(self.shapes)
+        return self
+
+    def surface(self) -> FrozenSet[Tuple[int, int]]:
+        """Every empty cell a falling rock could still get to, as (depth below the top, column), down to SURFACE_DEPTH.
+
+        Nothing below this can change again in practice, so it's everything about the board that matters for later
+        rocks.
+        """
+        board = self.board.keys
+        # The row above the top rock is all air, and the floor is at y=0
+        top = self.board_height - 1
+        max_depth = min(-top, SURFACE_DEPTH)
+        reachable = {(0, x) for x in range(7)}
+        to_visit = list(reachable)
+        while to_visit:
+            depth, column = to_visit.pop()
+            for cell in ((depth, column - 1), (depth, column + 1), (depth + 1, column)):
+                depth_to, column_to = cell
+                if (
+                    0 <= column_to < 7 and depth_to < max_depth and cell not in reachable
+                    and (top + depth_to) * COORD_STRIDE + column_to not in board
+                ):
+                    reachable.add(cell)
+                    to_visit.append(cell)
+        return frozenset(reachable)
+
+    def key(self) -> Tuple[Type[BaseShape], int, FrozenSet[Tuple[int, int]]]:
+        return self.next_shape, self.jet_index, self.surface()
+
+
+def find_cycle(raw_jets: str) -> Cycle:
+    max_steps = max(MAX_CYCLE_PASSES * 5 * len(raw_jets), 1000)
+    return utils.find_cycle(
+        Tower(raw_jets), step=Tower.drop, key=Tower.key, value=lambda x: -x.board_height, max_steps=max_steps
+    )
+
+
+def solve(raw_input: str) -> Tuple[int, int]:
+    # Both parts read off the same cycle, so finding it is all counted in part one
+    with PHASES.phase("part one"):
+        cycle = find_cycle(raw_input)
+        part_one = cycle.value_at(2022)
+    with PHASES.phase("part two"):
+        part_two = cycle.value_at(1000000000000)
+    return part_one, part_two
 
 
 def main():
-    cycle, offset, offset_height = find_cycle(read_data())
-    print(f"Part one: {run_sim_to_i(2022, cycle, offset, offset_height)}")
-    print(f"Part two: {run_sim_to_i(1000000000000, cycle, offset, offset_height)}")
+    part_one, part_two = solve(read_data(17))
+    print(f"Part one: {part_one}")
+    print(f"Part two: {part_two}")
 
 
 if __name__ == '__main__':
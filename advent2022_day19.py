@@ -1,11 +1,8 @@
-from utils import read_data
-from collections import deque
-from typing import NamedTuple, Deque, Iterable, Set
-import re
+from utils import read_data, parse_ints, parallel_map, PHASES
+from search import branch_and_bound
+from typing import NamedTuple, Iterable, Sequence, Tuple
 import math
 
-DIGITS = re.compile(r"\d+")
-
 
 class State(NamedTuple):
     time_left: int
@@ -36,13 +33,12 @@ class Blueprint:
     geodebot_ore: int
     geodebot_obsidian: int
 
-    def __init__(self, raw_line: str):
-        raw_parsed = DIGITS.findall(raw_line)
-        self.id = int(raw_parsed[0])
-        self.orebot_ore = int(raw_parsed[1])
-        self.claybot_ore = int(raw_parsed[2])
-        self.obsidianbot_ore, self.obsidianbot_clay = (int(x) for x in raw_parsed[3:5])
-        self.geodebot_ore, self.geodebot_obsidian = (int(x) for x in raw_parsed[5:7])
+    def __init__(self, numbers: Sequence[int]):
+        self.id = numbers[0]
+        self.orebot_ore = numbers[1]
+        self.claybot_ore = numbers[2]
+        self.obsidianbot_ore, self.obsidianbot_clay = numbers[3:5]
+        self.geodebot_ore, self.geodebot_obsidian = numbers[5:7]
         self.max_orebots_needed = max(self.orebot_ore, self.claybot_ore, self.obsidianbot_ore, self.geodebot_ore)
         self.max_claybots_needed = self.obsidianbot_clay
         self.max_obsidianbots_needed = self.geodebot_obsidian
@@ -118,24 +114,35 @@ class Blueprint:
 def get_max_geodes(blueprint: Blueprint, minutes_remaining: int = 24) -> int:
     # Start with a single ore bot and n minutes remaining
     starting_state = State(minutes_remaining, 1, 0, 0, 0, 0, 0, 0)
-    work_queue: Deque[State] = deque([starting_state])
-    seen_states: Set[State] = set()
-    max_geodes = 0
-    while len(work_queue) > 0:
-        state = work_queue.popleft()
-        max_geodes = max(max_geodes, state.geodes)
-        if state not in seen_states and state.upper_bound() > max_geodes:
-            work_queue.extend(blueprint.possible_actions(state))
-            seen_states.add(state)
-    return max_geodes
+    # possible_actions tries geode bots first, so diving depth first finds good scores early and prunes harder
+    return branch_and_bound(
+        [starting_state],
+        blueprint.possible_actions,
+        value=lambda state: state.geodes,
+        bound=State.upper_bound,
+        metrics="day19.get_max_geodes",
+    ).value
+
+
+def max_geodes_for(job: Tuple[Blueprint, int]) -> int:
+    return get_max_geodes(*job)
+
+
+def solve(raw_input: str) -> Tuple[int, int]:
+    with PHASES.phase("parse"):
+        parsed = [Blueprint(x) for x in parse_ints(raw_input, signed=False, fields=7).tolist()]
+    # Each part fans its own searches out, so the two can be timed separately
+    with PHASES.phase("part one"):
+        part_one = sum(x*i for i, x in enumerate(parallel_map(max_geodes_for, [(x, 24) for x in parsed]), start=1))
+    with PHASES.phase("part two"):
+        part_two = math.prod(parallel_map(max_geodes_for, [(x, 32) for x in parsed[:3]]))
+    return part_one, part_two
 
 
 def main():
-    parsed = [Blueprint(x) for x in read_data().splitlines()]
-    max_geodes = [get_max_geodes(x) for x in parsed]
-    print(f"Part one: {sum(x*i for i, x in enumerate(max_geodes, start=1))}")
-    max_geodes = [get_max_geodes(x, 32) for x in parsed[:3]]
-    print(f"Part two: {math.prod(max_geodes)}")
+    part_one, part_two = solve(read_data(19))
+    print(f"Part one: {part_one}")
+    print(f"Part two: {part_two}")
 
 
 if __name__ == "__main__":
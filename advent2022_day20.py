@@ -1,6 +1,6 @@
-from utils import read_data
+from utils import read_data, PHASES
 from collections import deque
-from typing import Deque, NamedTuple
+from typing import Deque, NamedTuple, Tuple
 
 
 class Node(NamedTuple):
@@ -28,14 +28,24 @@ class File:
         return sum(self.numlist[(1000 * (x + 1)) % list_len].value for x in range(3))
 
 
-def main():
-    efile = File(read_data())
-    efile.decrypt_file()
-    print(f"Part one: {efile.get_coordinates()}")
-    efile = File(read_data(), key=811589153)
-    for _ in range(10):
+def solve(raw_input: str) -> Tuple[int, int]:
+    with PHASES.phase("parse"):
+        efile = File(raw_input)
+        keyed_file = File(raw_input, key=811589153)
+    with PHASES.phase("part one"):
         efile.decrypt_file()
-    print(f"Part two: {efile.get_coordinates()}")
+        part_one = efile.get_coordinates()
+    with PHASES.phase("part two"):
+        for _ in range(10):
+            keyed_file.decrypt_file()
+        part_two = keyed_file.get_coordinates()
+    return part_one, part_two
+
+
+def main():
+    part_one, part_two = solve(read_data(20))
+    print(f"Part one: {part_one}")
+    print(f"Part two: {part_two}")
 
 
 if __name__ == "__main__":
@@ -1,8 +1,6 @@
 from contextlib import suppress
 from typing import Tuple, Dict
-from sympy import solve
-from sympy.parsing.sympy_parser import parse_expr
-from utils import read_data
+from utils import read_data, PHASES
 import time
 
 
@@ -50,11 +48,30 @@ def get_root_equation(known_items: Dict[str, int], unknown_items: Dict[str, str]
     return rolled_up_items["root"]
 
 
+def solve_for_humn(equation: str):
+    # sympy takes about half a second to import, so only pay for it once we actually need it
+    from sympy import solve
+    from sympy.parsing.sympy_parser import parse_expr
+    return solve(parse_expr(equation))[0]
+
+
+def solve(raw_input: str) -> Tuple[int, int]:
+    with PHASES.phase("parse"):
+        parsed = parse_input(raw_input)
+        parsed_without_humn = parse_input(raw_input, omit_humn=True)
+    with PHASES.phase("part one"):
+        monkeys, _ = resolve_items(*parsed)
+        part_one = int(monkeys['root'])
+    with PHASES.phase("part two"):
+        equation = get_root_equation(*resolve_items(*parsed_without_humn))
+        part_two = solve_for_humn(equation)
+    return part_one, part_two
+
+
 def main():
-    monkeys, _ = resolve_items(*parse_input(read_data()))
-    print(f"Part one: {int(monkeys['root'])}")
-    equation = get_root_equation(*resolve_items(*parse_input(read_data(), omit_humn=True)))
-    print(f"Part two: {solve(parse_expr(equation))[0]}")
+    part_one, part_two = solve(read_data(21))
+    print(f"Part one: {part_one}")
+    print(f"Part two: {part_two}")
 
 
 if __name__ == '__main__':
@@ -1,5 +1,6 @@
 from typing import Dict, Tuple, Optional
-from utils import read_data, BaseCoord as Coord
+from utils import read_data, BaseCoord as Coord, PHASES
+from cache import parse_cache
 
 NORTH, EAST, SOUTH, WEST = (0, 1, 2, 3)
 HEADING_VALUES = (3, 0, 1, 2)
@@ -141,10 +142,25 @@ class MonkeyMap:
         return (1000 * (loc.y + 1)) + (4 * (loc.x + 1)) + HEADING_VALUES[heading]
 
 
+@parse_cache
+def load_map(raw: str) -> MonkeyMap:
+    return MonkeyMap(raw)
+
+
+def solve(raw_input: str) -> Tuple[int, int]:
+    with PHASES.phase("parse"):
+        mmap = load_map(raw_input)
+    with PHASES.phase("part one"):
+        part_one = mmap.follow_path()
+    with PHASES.phase("part two"):
+        part_two = mmap.follow_path(cube=True)
+    return part_one, part_two
+
+
 def main():
-    mmap = MonkeyMap(read_data())
-    print(f"Part one: {mmap.follow_path()}")
-    print(f"Part two: {mmap.follow_path(cube=True)}")
+    part_one, part_two = solve(read_data(22))
+    print(f"Part one: {part_one}")
+    print(f"Part two: {part_two}")
 
 
 if __name__ == "__main__":
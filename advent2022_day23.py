@@ -1,7 +1,6 @@
-from collections import Counter
-from typing import Set, Dict
+from typing import Tuple
 
-from utils import read_data, BaseCoord as Coord, ALL_NEIGHBORS_2D
+from utils import read_data, BaseCoord as Coord, ALL_NEIGHBORS_2D, Grid, shift_cells, PHASES, np
 
 
 DIRECTIONS = [
@@ -15,63 +14,67 @@ DIRECTIONS = [
 class WanderingElves:
     def __init__(self, raw_input: str):
         self.round: int = 0
-        self.elves: Set[Coord] = set()
-        for y, line in enumerate(raw_input.splitlines()):
-            for x, char in enumerate(line):
-                if char == "#":
-                    self.elves.add(Coord(x=x, y=y))
-
-    def run_round(self):
-        propositions: Dict[Coord, Coord] = {}
-        for elf in self.elves:
-            adjacent_elves = {x: elf + x in self.elves for x in ALL_NEIGHBORS_2D}
-            # If there are no adjacent elves, stay still
-            if not any(adjacent_elves.values()):
-                propositions[elf] = elf
-                continue
-            else:
-                for i in range(4):
-                    if not any(adjacent_elves[x] for x in DIRECTIONS[(self.round + i) % 4]):
-                        propositions[elf] = elf + DIRECTIONS[(self.round + i) % 4][0]
-                        break
-            if elf not in propositions:
-                propositions[elf] = elf
-
-        counts = Counter(propositions.values())
-        self.elves = {v if counts[v] == 1 else k for k, v in propositions.items()}
-        self.round += 1
+        self.elves = Grid.from_text(raw_input, {"#": True}, fill=False, dtype=bool)
+
+    def run_round(self) -> bool:
+        """Moves every elf at once, and returns whether any of them actually moved."""
+        # Keep a free border around the elves so nobody can step off the edge of the array
+        if self.elves.cells[[0, -1], :].any() or self.elves.cells[:, [0, -1]].any():
+            self.elves = self.elves.pad(1)
+        elves = self.elves.cells
+        adjacent = {x: self.elves.shift(x) for x in ALL_NEIGHBORS_2D}
+        # If there are no adjacent elves, stay still
+        undecided = elves & np.logical_or.reduce(list(adjacent.values()))
+        proposals = []
+        for i in range(4):
+            direction = DIRECTIONS[(self.round + i) % 4]
+            proposing = undecided & ~(adjacent[direction[0]] | adjacent[direction[1]] | adjacent[direction[2]])
+            undecided &= ~proposing
+            # Move each proposal onto the tile it wants, so collisions line up
+            proposals.append((direction[0], shift_cells(proposing, direction[0] * -1, False)))
 
+        contested = sum(x.astype(np.int8) for _, x in proposals) > 1
+        moved = False
+        for step, targets in proposals:
+            arriving = targets & ~contested
+            moved = moved or bool(arriving.any())
+            elves |= arriving
+            elves &= ~shift_cells(arriving, step, False)
+        self.round += 1
+        return moved
 
     def print_board(self):
-        min_x, max_x = min(x.x for x in self.elves), max(x.x for x in self.elves)
-        min_y, max_y = min(x.y for x in self.elves), max(x.y for x in self.elves)
-        for y in range(min_y, max_y+1):
-            for x in range(min_x, max_x+1):
-                print("#" if Coord(x=x, y=y) in self.elves else ".", end='')
-            print("\n", end='')
+        for row in self.elves.trim().cells:
+            print(''.join("#" if x else "." for x in row))
         print("-----")
 
     def get_empty_tiles(self) -> int:
-        min_x, max_x = min(x.x for x in self.elves), max(x.x for x in self.elves)
-        min_y, max_y = min(x.y for x in self.elves), max(x.y for x in self.elves)
-        rect_size = len(range(min_x, max_x+1)) * len(range(min_y, max_y+1))
-        return rect_size - len(self.elves)
+        occupied = self.elves.trim().cells
+        return occupied.size - int(occupied.sum())
 
     def run_until_stopped(self) -> int:
-        while True:
-            old_board = self.elves.copy()
-            self.run_round()
-            if old_board == self.elves:
-                return self.round
+        while self.run_round():
+            pass
+        return self.round
+
+
+def solve(raw_input: str) -> Tuple[int, int]:
+    with PHASES.phase("parse"):
+        elves = WanderingElves(raw_input)
+        part_two_elves = WanderingElves(raw_input)
+    with PHASES.phase("part one"):
+        for i in range(10):
+            elves.run_round()
+        part_one = elves.get_empty_tiles()
+    with PHASES.phase("part two"):
+        part_two = part_two_elves.run_until_stopped()
+    return part_one, part_two
 
 
 def main():
-    elves = WanderingElves(read_data())
-    for i in range(10):
-        elves.run_round()
-    print(f"Part 1: {elves.get_empty_tiles()}")
-    elves = WanderingElves(read_data())
-    print(f"Part 2: {elves.run_until_stopped()}")
+    part_one, part_two = solve(read_data(23))
+    print(f"Part 1: {part_one}")
+    print(f"Part 2: {part_two}")
 
 
 if __name__ == '__main__':
@@ -1,8 +1,9 @@
-from collections import defaultdict, deque
-from typing import Set, DefaultDict, Deque, Tuple
+from collections import defaultdict
+from typing import Set, DefaultDict, Tuple, Iterator
 from math import lcm
 
-from utils import read_data, BaseCoord as Coord
+from utils import read_data, BaseCoord as Coord, PHASES
+from search import bfs
 
 
 class Blizzards:
@@ -47,36 +48,43 @@ class Blizzards:
         end_loc: Coord = Coord(x=self.max_x - 1, y=self.max_y)
         if reverse:
             start_loc, end_loc = end_loc, start_loc
-        work_queue: Deque[Tuple[Coord, int]] = deque([(start_loc, starting_depth)])
-        min_time: int = 99999
-        seen_states: Set[Tuple[Coord, int]] = set()
+        # The blizzards all loop around, so states more than a full cycle apart are the same state
         repeat = lcm(self.width, self.height)
-        while len(work_queue) > 0:
-            loc, depth = work_queue.popleft()
-            if loc == end_loc:
-                min_time = min(depth, min_time)
-                continue
-            if depth > min_time:
-                continue
-            if (loc, depth % repeat) not in seen_states:
-                seen_states.add((loc, depth % repeat))
-                work_queue.extend(
-                    (x, depth + 1)
-                    for x in loc.cardinal_neighbors()
-                    if x not in self.walls and not self.occupied(x, depth + 1)
-                )
-                if loc not in self.walls and not self.occupied(loc, depth + 1):
-                    work_queue.append((loc, depth+1))
-        return min_time
+
+        def moves(state: Tuple[Coord, int]) -> Iterator[Tuple[Coord, int]]:
+            loc, depth = state
+            for x in (*loc.cardinal_neighbors(), loc):
+                if x not in self.walls and not self.occupied(x, depth + 1):
+                    yield x, depth + 1
+
+        # Every move takes a minute, so the first time BFS reaches the end is the fastest
+        result = bfs(
+            [(start_loc, starting_depth)],
+            moves,
+            key=lambda state: (state[0], state[1] % repeat),
+            is_goal=lambda state: state[0] == end_loc,
+            metrics="day24.pathfind",
+        )
+        if result.goal is None:
+            raise ValueError("There's no way through the blizzards")
+        return result.goal[1]
+
+
+def solve(raw_input: str) -> Tuple[int, int]:
+    with PHASES.phase("parse"):
+        blizzards = Blizzards(raw_input)
+    with PHASES.phase("part one"):
+        there_time = blizzards.pathfind()
+    with PHASES.phase("part two"):
+        back_time = blizzards.pathfind(there_time, reverse=True)
+        there_again_time = blizzards.pathfind(back_time)
+    return there_time, there_again_time
 
 
 def main():
-    blizzards = Blizzards(read_data())
-    there_time = blizzards.pathfind()
-    print(f"Part one: {there_time}")
-    back_time = blizzards.pathfind(there_time, reverse=True)
-    there_again_time = blizzards.pathfind(back_time)
-    print(f"Part two: {there_again_time}")
+    part_one, part_two = solve(read_data(24))
+    print(f"Part one: {part_one}")
+    print(f"Part two: {part_two}")
 
 
 if __name__ == "__main__":
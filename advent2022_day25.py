@@ -1,4 +1,5 @@
-from utils import read_data
+from typing import Tuple
+from utils import read_data, PHASES
 
 
 SNAFU_DIGITS = {
@@ -26,9 +27,18 @@ def int_to_snafu(value: int) -> str:
     return ''
 
 
+def solve(raw_input: str) -> Tuple[str, None]:
+    with PHASES.phase("parse"):
+        snafus = raw_input.splitlines()
+    # Day 25 only has the one puzzle
+    with PHASES.phase("part one"):
+        part_one = int_to_snafu(sum(snafu_to_int(x) for x in snafus))
+    return part_one, None
+
+
 def main():
-    summed_snafus = sum(snafu_to_int(x) for x in read_data().splitlines())
-    print(f"Part one: {int_to_snafu(summed_snafus)}")
+    part_one, _ = solve(read_data(25))
+    print(f"Part one: {part_one}")
 
 
 if __name__ == '__main__':
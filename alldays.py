@@ -1,16 +1,490 @@
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from functools import partial
 from importlib import import_module
+from importlib.util import find_spec
+from types import ModuleType
+from typing import Callable, List, NamedTuple, Iterable, Dict, Optional, Tuple
+from cache import ResultCache, content_hash, local_sources
+import cache as cache_module
+from generators import generate
+from utils import METRICS, PHASES, INPUT_OVERRIDES, load_bytes, read_data, clear_memos, memo_stats
+import utils
+from pathlib import Path
+import argparse
+import cProfile
+import io
+import json
+import math
+import os
+import platform
+import pstats
+import statistics
+import sys
 import time
+import tracemalloc
 
-times = []
-for i in range(1, 26):
-    print(f"-----DAY {i}-----")
+try:
+    import resource
+except ImportError:
+    # Not available on Windows, so RSS just doesn't get reported there
+    resource = None
+
+
+class DayResult(NamedTuple):
+    day: int
+    output: str
+    elapsed: float
+    peak_alloc: Optional[int] = None
+    rss_delta: Optional[int] = None
+    metrics: Optional[Dict[str, float]] = None
+    cached: bool = False
+    import_time: Optional[float] = None
+    # Nanoseconds spent in each phase of the day's solve (parse, part one, part two)
+    phases: Optional[Dict[str, int]] = None
+    # What solve() returned, as strings the same way batch.py and daemon.py report them
+    answers: Optional[List[Optional[str]]] = None
+
+
+class RunOptions(NamedTuple):
+    memory: bool = False
+    metrics: bool = False
+    # When set, days run against a generated input of this size instead of their input file
+    generate_size: Optional[int] = None
+    seed: int = 0
+    cache: Optional[ResultCache] = None
+
+
+class Tee(io.TextIOBase):
+    def __init__(self, *streams):
+        self.streams = streams
+
+    def write(self, text: str) -> int:
+        for stream in self.streams:
+            stream.write(text)
+        return len(text)
+
+    def flush(self):
+        for stream in self.streams:
+            stream.flush()
+
+
+def format_answers(answers: List[Optional[str]]) -> str:
+    # The same lines each day's main() prints, where a None answer (day 25's part two) doesn't get one
+    return "".join(f"Part {part}: {x}\n" for part, x in zip(("one", "two"), answers) if x is not None)
+
+
+def available_days() -> List[int]:
+    # Stop at the first missing day, same as the old import loop, but without importing anything yet
+    days = []
+    for i in range(1, 26):
+        if find_spec(f"advent2022_day{i:02}") is None:
+            break
+        days.append(i)
+    return days
+
+
+def proc_status(field: str) -> Optional[int]:
+    # Linux only, where /proc/self/status gives the current (VmRSS) and peak (VmHWM) RSS in kilobytes
+    try:
+        with open("/proc/self/status") as status:
+            line = next((x for x in status if x.startswith(f"{field}:")), None)
+    except OSError:
+        return None
+    return None if line is None else int(line.split()[1]) * 1024
+
+
+def reset_peak_rss() -> bool:
+    # Writing 5 to clear_refs resets VmHWM to the current RSS, so the next peak only covers what runs after this
+    try:
+        with open("/proc/self/clear_refs", "w") as clear_refs:
+            clear_refs.write("5")
+    except OSError:
+        return False
+    return proc_status("VmHWM") is not None
+
+
+def max_rss() -> int:
+    peak = proc_status("VmHWM")
+    if peak is not None:
+        return peak
+    if resource is None:
+        return 0
+    # ru_maxrss is in kilobytes on Linux but bytes on macOS
+    scale = 1 if sys.platform == "darwin" else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+
+
+def rss_baseline() -> int:
+    if reset_peak_rss():
+        return proc_status("VmRSS")
+    # Without a way to reset it, the high-water mark is process-wide, so the delta from here on only shows how
+    # much further this day pushed it, and a day that runs after a hungrier one reports little or nothing
+    return max_rss()
+
+
+def load_day(day_num: int, options: RunOptions) -> Tuple[ModuleType, float]:
+    # Parsed inputs only get reused when results can be too, so measuring runs always pay for parsing
+    cache_module.parse_cache_enabled = options.cache is not None
+    prepare_input(day_num, options)
+    import_start = time.perf_counter()
+    day = import_module(f"advent2022_day{day_num:02}")
+    return day, time.perf_counter() - import_start
+
+
+def prepare_input(day_num: int, options: RunOptions):
+    if options.generate_size is not None:
+        # The day reads its input through read_data(), which checks the overrides first
+        INPUT_OVERRIDES[f"advent2022_day{day_num:02}"] = generate(day_num, options.generate_size, options.seed)
+
+
+def cache_key(day_num: int) -> str:
+    # Anything that can change a day's answers: its input and the source of every local module it can reach
+    sources = local_sources(f"advent2022_day{day_num:02}")
+    return content_hash(load_bytes(day_num), *(x.encode() + sources[x] for x in sorted(sources)))
+
+
+def run_day(day_num: int, options: RunOptions = RunOptions(), capture: bool = True) -> DayResult:
+    day_start = time.perf_counter()
+    if options.cache is not None:
+        prepare_input(day_num, options)
+        key = cache_key(day_num)
+        cached = options.cache.get(key)
+        if cached is not None:
+            if not capture:
+                print(cached["output"], end='')
+            return DayResult(
+                day_num, cached["output"], time.perf_counter() - day_start, cached=True, answers=cached["answers"]
+            )
+
+    METRICS.enabled = options.metrics
+    METRICS.reset()
+    PHASES.reset()
+    # Start every day cold, so its memo stats (and timings) don't depend on what ran before it in this process
+    clear_memos()
+    # Tracing and metrics only see this process, so keep any sub-problems a day fans out in here with them
+    utils.PARALLEL_WORKERS = 1 if options.memory or options.metrics else None
+    if options.memory:
+        # Start tracing before the import, so anything a day allocates at import time counts too
+        rss_start = rss_baseline()
+        tracemalloc.start()
+    day, import_time = load_day(day_num, options)
+    output = io.StringIO()
+    day_start = time.perf_counter()
+    # Each day's prints get collected separately so parallel runs can still be printed in order
+    with redirect_stdout(output if capture else Tee(output, sys.stdout)):
+        answers = [None if x is None else str(x) for x in day.solve(read_data(day_num))]
+        print(format_answers(answers), end='')
+    elapsed = time.perf_counter() - day_start
+    peak_alloc = rss_delta = None
+    if options.memory:
+        _, peak_alloc = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        # How far RSS peaked above where it was when the day started (run_isolated() keeps that per day)
+        rss_delta = max_rss() - rss_start
+    day_metrics = {**METRICS.snapshot(), **memo_stats()} if options.metrics else None
+    if options.cache is not None:
+        options.cache.put(key, {"output": output.getvalue(), "answers": answers})
+    return DayResult(
+        day_num, output.getvalue(), elapsed, peak_alloc, rss_delta, day_metrics,
+        import_time=import_time, phases=PHASES.snapshot(), answers=answers,
+    )
+
+
+def run_isolated(day_num: int, options: RunOptions) -> DayResult:
+    # A fresh process per day, so memory an earlier day left behind can't hide how much this one needs
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        return executor.submit(run_day, day_num, options).result()
+
+
+def run_serial(days: Iterable[int], options: RunOptions) -> Iterable[DayResult]:
+    for day_num in days:
+        print(f"-----DAY {day_num}-----")
+        if options.memory:
+            result = run_isolated(day_num, options)
+            print(result.output, end='')
+            yield result
+        else:
+            yield run_day(day_num, options, capture=False)
+
+
+def run_profiled(days: Iterable[int], options: RunOptions, out_dir: Path, top: int) -> Iterable[DayResult]:
+    for day_num in days:
+        print(f"-----DAY {day_num}-----")
+        yield profile_day(day_num, options, out_dir, top)
+
+
+def run_parallel(days: List[int], workers: int, options: RunOptions) -> Iterable[DayResult]:
+    pool_options = {}
+    if options.memory and sys.version_info >= (3, 11):
+        # Same as run_isolated(), every day gets a worker of its own
+        pool_options["max_tasks_per_child"] = 1
+    with ProcessPoolExecutor(max_workers=min(workers, len(days)), **pool_options) as executor:
+        # map() hands results back in submission order, so output stays ordered by day
+        for result in executor.map(partial(run_day, options=options), days):
+            print(f"-----DAY {result.day}-----")
+            print(result.output, end='')
+            yield result
+
+
+class BenchStats(NamedTuple):
+    day: int
+    runs: int
+    min_ns: int
+    median_ns: float
+    p95_ns: int
+    stddev_ns: float
+
+
+class SampleStats(NamedTuple):
+    samples: int
+    min_ns: float
+    median_ns: float
+    p95_ns: float
+    stddev_ns: float
+
+
+def sample_stats(samples: Iterable[float]) -> SampleStats:
+    # Shared with microbench.py, so both report the same statistics the same way
+    ordered = sorted(samples)
+    # Nearest-rank percentile, so p95 is always an actual observed sample
+    p95 = ordered[math.ceil(0.95 * len(ordered)) - 1]
+    stddev = statistics.stdev(ordered) if len(ordered) > 1 else 0.0
+    return SampleStats(len(ordered), ordered[0], statistics.median(ordered), p95, stddev)
+
+
+def summarize(day_num: int, samples: List[int]) -> BenchStats:
+    return BenchStats(day_num, *sample_stats(samples))
+
+
+def benchmark_day(day_num: int, options: RunOptions, warmup: int, repetitions: int) -> BenchStats:
+    day, _ = load_day(day_num, options)
+    samples = []
+    # We only care about timings here, so throw away everything the day prints
+    with redirect_stdout(io.StringIO()):
+        for _ in range(warmup):
+            day.main()
+        for _ in range(repetitions):
+            # Otherwise every run after the first would get the previous run's memoized results for free
+            clear_memos()
+            start = time.perf_counter_ns()
+            day.main()
+            samples.append(time.perf_counter_ns() - start)
+    return summarize(day_num, samples)
+
+
+def save_baseline(path: Path, results: List[BenchStats]):
+    baseline = {
+        "python": platform.python_version(),
+        "days": {str(x.day): x._asdict() for x in results},
+    }
+    path.write_text(json.dumps(baseline, indent=2))
+
+
+def compare_medians(
+    path: Path,
+    section: str,
+    medians: Dict[str, float],
+    threshold: float,
+    label: Callable[[str], str],
+    format_ns: Callable[[float], str],
+) -> List[str]:
+    """Print how each median moved since the results saved under section in path, and return the keys that slowed
+    down by more than threshold. Also used by microbench.py.
+    """
+    saved: Dict[str, Dict] = json.loads(path.read_text())[section]
+    slower = []
+    print(f"Compared to {path} (threshold {threshold:.0%}):")
+    for key, median_ns in medians.items():
+        old: Optional[Dict] = saved.get(key)
+        if old is None:
+            print(f"{label(key)}: no baseline")
+            continue
+        change = median_ns / old["median_ns"] - 1
+        flag = ""
+        if change > threshold:
+            flag = " SLOWER"
+            slower.append(key)
+        elif change < -threshold:
+            flag = " FASTER"
+        print(f"{label(key)}: {format_ns(old['median_ns'])} -> {format_ns(median_ns)} ({change:+.1%}){flag}")
+    return slower
+
+
+def compare_to_baseline(path: Path, results: List[BenchStats], threshold: float) -> List[int]:
+    slower = compare_medians(
+        path, "days", {str(x.day): x.median_ns for x in results}, threshold,
+        label=lambda day: f"Day {day}", format_ns=lambda ns: f"{ns / 1e6:.3f}ms",
+    )
+    return [int(x) for x in slower]
+
+
+def run_benchmark(days: List[int], options: RunOptions, args: argparse.Namespace) -> int:
+    results = []
+    for day_num in days:
+        stats = benchmark_day(day_num, options, args.warmup, args.benchmark)
+        results.append(stats)
+        print(
+            f"Day {day_num}: min {stats.min_ns / 1e6:.3f}ms, median {stats.median_ns / 1e6:.3f}ms, "
+            f"p95 {stats.p95_ns / 1e6:.3f}ms, stddev {stats.stddev_ns / 1e6:.3f}ms ({stats.runs} runs)"
+        )
+    if args.save_baseline:
+        save_baseline(args.save_baseline, results)
+    if args.compare:
+        # Exit non-zero on slowdowns so this can gate a change
+        return 1 if compare_to_baseline(args.compare, results, args.threshold) else 0
+    return 0
+
+
+def profile_day(day_num: int, options: RunOptions, out_dir: Path, top: int) -> DayResult:
+    day, _ = load_day(day_num, options)
+    # Same as with --memory, the profiler would only see the pool waiting on its workers
+    utils.PARALLEL_WORKERS = 1
+    profiler = cProfile.Profile()
+    day_start = time.perf_counter()
+    profiler.runcall(day.main)
+    elapsed = time.perf_counter() - day_start
+    out_dir.mkdir(parents=True, exist_ok=True)
+    stats_file = out_dir / f"day{day_num:02}.pstats"
+    profiler.dump_stats(stats_file)
+    summary = io.StringIO()
+    # Sort by time spent in the function itself, which is what points at the actual hot spot
+    pstats.Stats(profiler, stream=summary).strip_dirs().sort_stats("tottime").print_stats(top)
+    print(f"Profile written to {stats_file}")
+    print(summary.getvalue())
+    return DayResult(day_num, "", elapsed)
+
+
+def parse_budgets(raw_budgets: List[str]) -> Dict[Optional[int], float]:
+    # Either a bare MB value that applies to every day, or DAY=MB for a single day
+    budgets: Dict[Optional[int], float] = {}
+    for raw in raw_budgets:
+        day, _, megabytes = raw.rpartition("=")
+        budgets[int(day) if day else None] = float(megabytes)
+    return budgets
+
+
+def over_budget(results: List[DayResult], budgets: Dict[Optional[int], float]) -> List[int]:
+    failed = []
+    for result in results:
+        budget = budgets.get(result.day, budgets.get(None))
+        if budget is not None and result.peak_alloc / 2**20 > budget:
+            print(f"Day {result.day} exceeded its memory budget: {result.peak_alloc / 2**20:.1f}MB > {budget}MB")
+            failed.append(result.day)
+    return failed
+
+
+def format_result(result: DayResult) -> str:
+    line = f"Day {result.day}: {result.elapsed}"
+    if result.cached:
+        line += " (cached)"
+    if result.import_time is not None:
+        line += f" (import {result.import_time:.4f})"
+    if result.phases:
+        line += " (" + ", ".join(f"{k} {v / 1e9:.4f}" for k, v in result.phases.items()) + ")"
+    if result.peak_alloc is not None:
+        line += f" (peak {result.peak_alloc / 2**20:.1f}MB traced, +{result.rss_delta / 2**20:.1f}MB RSS)"
+    if result.metrics:
+        line += "".join(f"\n    {k}: {v}" for k, v in sorted(result.metrics.items()))
+    return line
+
+
+def cpu_info() -> Dict[str, Optional[str]]:
+    model = platform.processor() or None
     try:
-        day = import_module(f"advent2022_day{i:02}")
-    except ModuleNotFoundError:
-        break
-    day_start = time.monotonic()
-    day.main()
-    times.append(time.monotonic()-day_start)
-print("Individual days:")
-print("\n".join(f"Day {i}: {x}" for i, x in enumerate(times, start=1)))
-print(f"Time for all days: {sum(times)}")
+        # platform.processor() is usually empty on Linux, where the model name lives in /proc instead
+        with open("/proc/cpuinfo") as cpuinfo:
+            model = next((x.split(":", 1)[1].strip() for x in cpuinfo if x.startswith("model name")), model)
+    except OSError:
+        pass
+    return {"model": model, "machine": platform.machine(), "count": os.cpu_count()}
+
+
+def write_report(path: Path, results: List[DayResult], wall_time: float):
+    report = {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "cpu": cpu_info(),
+        "wall_time_ns": round(wall_time * 1e9),
+        "days": [
+            {
+                "day": x.day,
+                "answers": x.answers,
+                "cached": x.cached,
+                "elapsed_ns": round(x.elapsed * 1e9),
+                "import_ns": None if x.import_time is None else round(x.import_time * 1e9),
+                "phases_ns": x.phases,
+                "peak_alloc": x.peak_alloc,
+                "rss_delta": x.rss_delta,
+                "metrics": x.metrics,
+            }
+            for x in results
+        ],
+    }
+    path.write_text(json.dumps(report, indent=2))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run every day's solution")
+    parser.add_argument("--parallel", action="store_true", help="run days in a process pool")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="worker processes for --parallel")
+    parser.add_argument("--benchmark", type=int, metavar="N", help="time N repetitions of each day instead")
+    parser.add_argument("--warmup", type=int, default=1, help="untimed runs before benchmarking each day")
+    parser.add_argument("--save-baseline", type=Path, metavar="FILE", help="write benchmark results to a JSON file")
+    parser.add_argument("--compare", type=Path, metavar="FILE", help="compare benchmark results to a JSON baseline")
+    parser.add_argument("--threshold", type=float, default=0.05, help="median change to flag when comparing")
+    parser.add_argument("--profile", action="store_true", help="run each day under cProfile")
+    parser.add_argument("--profile-dir", type=Path, default=Path("profiles"), help="where to write .pstats files")
+    parser.add_argument("--top", type=int, default=15, help="hot functions to list per profiled day")
+    parser.add_argument(
+        "--memory", action="store_true", help="report peak traced allocation and RSS growth, each day in a new process",
+    )
+    parser.add_argument(
+        "--memory-budget", action="append", default=[], metavar="[DAY=]MB",
+        help="fail if a day's peak traced allocation exceeds MB (implies --memory, repeatable)",
+    )
+    parser.add_argument("--metrics", action="store_true", help="collect and print each day's solver metrics")
+    parser.add_argument("--generate", type=int, metavar="SIZE", help="run against generated inputs of this size")
+    parser.add_argument("--seed", type=int, default=0, help="random seed for --generate")
+    parser.add_argument("--no-cache", action="store_true", help="ignore cached results and don't store new ones")
+    parser.add_argument("--clear-cache", action="store_true", help="empty the result cache before running")
+    parser.add_argument("--cache-size", type=float, default=10, metavar="MB", help="result cache size cap")
+    parser.add_argument("--report", type=Path, metavar="FILE", help="also write answers and timings as JSON")
+    parser.add_argument("days", type=int, nargs="*", help="days to run (default: all)")
+    args = parser.parse_args()
+
+    days = args.days or available_days()
+    budgets = parse_budgets(args.memory_budget)
+    memory = args.memory or bool(budgets)
+    cache = ResultCache(max_bytes=int(args.cache_size * 2**20))
+    if args.clear_cache:
+        cache.clear()
+    # Anything measuring the run itself needs the day to actually run
+    if args.no_cache or memory or args.metrics or args.profile or args.benchmark:
+        cache = None
+    options = RunOptions(memory, args.metrics, args.generate, args.seed, cache)
+    if args.benchmark:
+        sys.exit(run_benchmark(days, options, args))
+    wall_start = time.perf_counter()
+    if args.profile:
+        runner = run_profiled(days, options, args.profile_dir, args.top)
+    elif args.parallel:
+        runner = run_parallel(days, args.workers, options)
+    else:
+        runner = run_serial(days, options)
+    results = list(runner)
+    wall_time = time.perf_counter() - wall_start
+    print("Individual days:")
+    print("\n".join(format_result(x) for x in results))
+    print(f"Time for all days: {sum(x.elapsed for x in results)}")
+    print(f"Import time for all days: {sum(x.import_time or 0 for x in results)}")
+    print(f"Wall time: {wall_time}")
+    if args.report:
+        write_report(args.report, results, wall_time)
+    if budgets and over_budget(results, budgets):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
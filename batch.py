@@ -0,0 +1,91 @@
+from concurrent.futures import ProcessPoolExecutor
+from fnmatch import fnmatch
+from pathlib import Path
+from types import ModuleType
+from typing import Callable, Dict, Any, Optional
+import argparse
+import json
+import os
+import sys
+import time
+
+# Solves every input file in a directory (or every input for the day in a store packed by inputstore.py) for one
+# day, fanning them out over a process pool. Each worker imports the day once and then keeps solving, and results are
+# written as one JSON object per line as they come back.
+
+_worker_day: Optional[int] = None
+_worker_module: Optional[ModuleType] = None
+_worker_store = None
+
+
+def init_worker(day_num: int, use_cache: bool, store_path: Optional[Path] = None):
+    global _worker_day, _worker_module, _worker_store
+    from importlib import import_module
+    from utils import day_module
+    import cache
+
+    cache.parse_cache_enabled = use_cache
+    _worker_day = day_num
+    _worker_module = import_module(day_module(day_num))
+    if store_path is not None:
+        # Every worker maps the same file, so the inputs are only in memory once however many workers there are
+        from inputstore import open_store
+        _worker_store = open_store(store_path)
+
+
+def solve_input(name: str, read: Callable[[], str]) -> Dict[str, Any]:
+    start = time.perf_counter()
+    try:
+        answers = _worker_module.solve(read())
+    except Exception as e:
+        return {"input": name, "ok": False, "error": f"{type(e).__name__}: {e}"}
+    return {
+        "input": name,
+        "ok": True,
+        "answers": [None if x is None else str(x) for x in answers],
+        "elapsed": time.perf_counter() - start,
+    }
+
+
+def solve_file(path: Path) -> Dict[str, Any]:
+    return solve_input(str(path), path.read_text)
+
+
+def solve_stored(input_id: str) -> Dict[str, Any]:
+    return solve_input(input_id, lambda: _worker_store.read_text(_worker_day, input_id))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Solve a directory of inputs for one day, streaming JSON lines")
+    parser.add_argument("day", type=int)
+    parser.add_argument("source", type=Path, help="directory of input files, or a store packed by inputstore.py")
+    parser.add_argument("--pattern", default="*", help="glob for input files (or stored input ids) to solve")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument("--chunksize", type=int, default=1, help="inputs handed to a worker at a time")
+    parser.add_argument("--no-cache", action="store_true", help="don't read or write the parse cache")
+    args = parser.parse_args()
+
+    if args.source.is_dir():
+        store_path = None
+        solve = solve_file
+        inputs = sorted(x for x in args.source.glob(args.pattern) if x.is_file())
+    else:
+        from inputstore import open_store
+        store_path = args.source
+        solve = solve_stored
+        inputs = sorted(x for x in open_store(store_path).ids(args.day) if fnmatch(x, args.pattern))
+    failures = 0
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=init_worker,
+                             initargs=(args.day, not args.no_cache, store_path)) as executor:
+        for result in executor.map(solve, inputs, chunksize=args.chunksize):
+            failures += not result["ok"]
+            print(json.dumps(result), flush=True)
+    elapsed = time.perf_counter() - start
+    print(f"Solved {len(inputs) - failures}/{len(inputs)} inputs in {elapsed:.3f}s", file=sys.stderr)
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
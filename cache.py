@@ -0,0 +1,153 @@
+from collections import OrderedDict
+from functools import lru_cache, wraps
+from importlib.util import find_spec
+from pathlib import Path
+from typing import Optional, Callable, Any, Dict, Tuple
+import ast
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import shutil
+
+CACHE_ROOT = Path(".cache")
+PARSE_CACHE_DIR = CACHE_ROOT / "parsed"
+PARSE_CACHE_MAX_BYTES = 256 * 2**20
+# alldays.py turns this off whenever it needs the real parsing cost (benchmarks, profiles, --no-cache)
+parse_cache_enabled = True
+# Long-lived processes (daemon.py) can also keep this many parses in memory. Those get handed out shared rather than
+# as fresh copies, so it's off by default.
+parse_memory_size = 0
+_PARSE_MEMORY: "OrderedDict[str, Any]" = OrderedDict()
+
+
+def content_hash(*parts: bytes) -> str:
+    digest = hashlib.sha256()
+    for part in parts:
+        # Length-prefix each part so (b"ab", b"c") and (b"a", b"bc") don't collide
+        digest.update(len(part).to_bytes(8, "little"))
+        digest.update(part)
+    return digest.hexdigest()
+
+
+@lru_cache(maxsize=None)
+def imported_names(source: bytes) -> Tuple[str, ...]:
+    # Parsing utils takes most of the time a cache hit costs, so each version of a file only gets parsed once
+    imported = []
+    # A module's main() is its command line, which never runs as part of a day
+    body = [x for x in ast.parse(source).body if not (isinstance(x, ast.FunctionDef) and x.name == "main")]
+    for node in (x for top_level in body for x in ast.walk(top_level)):
+        if isinstance(node, ast.Import):
+            imported.extend(x.name for x in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+            imported.append(node.module)
+    return tuple(imported)
+
+
+def local_sources(module_name: str) -> Dict[str, bytes]:
+    """The source of a module and of every module from this repo it imports, directly or not.
+
+    Imports inside functions count too, since that's how days pull in their heavier helpers.
+    """
+    root = Path(__file__).resolve().parent
+    sources: Dict[str, bytes] = {}
+    pending = [module_name]
+    while pending:
+        name = pending.pop().partition(".")[0]
+        if name in sources:
+            continue
+        spec = find_spec(name)
+        if spec is None or not spec.has_location or Path(spec.origin).resolve().parent != root:
+            continue
+        sources[name] = Path(spec.origin).read_bytes()
+        pending.extend(imported_names(sources[name]))
+    return sources
+
+
+def write_atomically(path: Path, data: bytes):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Write then rename, so parallel workers never see a half-written entry
+    temp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    temp_path.write_bytes(data)
+    os.replace(temp_path, path)
+
+
+def evict_lru(directory: Path, pattern: str, max_bytes: int):
+    entries = []
+    for path in directory.glob(pattern):
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        path.unlink(missing_ok=True)
+        total -= size
+
+
+def parse_cache(func: Callable[[str], Any]) -> Callable[[str], Any]:
+    """Persist what a parse function builds from its raw input, so later runs can unpickle it instead.
+
+    The key covers the input text and the source of the function's module plus every local module it imports, so
+    editing the parsing code, a constant it reads or a class it pickles invalidates old entries.
+    """
+    @wraps(func)
+    def wrapper(raw_input: str):
+        if not parse_cache_enabled:
+            return func(raw_input)
+        # By file rather than by module name, which is just __main__ when a day is run as a script
+        sources = local_sources(Path(inspect.getfile(func)).stem)
+        key = content_hash(
+            raw_input.encode(), f"{func.__module__}.{func.__qualname__}".encode(),
+            *(x.encode() + sources[x] for x in sorted(sources)),
+        )
+        if key in _PARSE_MEMORY:
+            _PARSE_MEMORY.move_to_end(key)
+            return _PARSE_MEMORY[key]
+        path = PARSE_CACHE_DIR / f"{key}.pickle"
+        try:
+            parsed = pickle.loads(path.read_bytes())
+            os.utime(path)
+        except (FileNotFoundError, pickle.UnpicklingError, AttributeError, EOFError, ImportError):
+            # Either it's new, or something it refers to has changed shape since it was written; rebuild it
+            parsed = func(raw_input)
+            write_atomically(path, pickle.dumps(parsed, protocol=pickle.HIGHEST_PROTOCOL))
+            evict_lru(PARSE_CACHE_DIR, "*.pickle", PARSE_CACHE_MAX_BYTES)
+        if parse_memory_size > 0:
+            _PARSE_MEMORY[key] = parsed
+            while len(_PARSE_MEMORY) > parse_memory_size:
+                _PARSE_MEMORY.popitem(last=False)
+        return parsed
+    return wrapper
+
+
+class ResultCache:
+    """On-disk cache of day results, keyed by content hash, evicting least recently used entries past max_bytes.
+
+    Each entry is a JSON object holding what the day printed ("output") and its answers ("answers").
+    """
+
+    def __init__(self, directory: Path = CACHE_ROOT / "results", max_bytes: int = 10 * 2**20):
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        path = self.directory / f"{key}.json"
+        try:
+            result = json.loads(path.read_text())
+        except FileNotFoundError:
+            return None
+        # Bump the mtime, which is what eviction goes by
+        os.utime(path)
+        return result
+
+    def put(self, key: str, result: Dict[str, Any]):
+        write_atomically(self.directory / f"{key}.json", json.dumps(result).encode())
+        evict_lru(self.directory, "*.json", self.max_bytes)
+
+    def clear(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
@@ -0,0 +1,122 @@
+from pathlib import Path
+from typing import Dict, Any, Optional
+import argparse
+import json
+import socket
+import sys
+import time
+
+# A long-running process that keeps every day imported (and its parses warm) and answers requests over a Unix
+# socket, one JSON object per line each way. The client side only needs the stdlib, so it starts up quickly.
+
+DEFAULT_SOCKET = Path(".cache/daemon.sock")
+
+
+def serve(socket_path: Path):
+    from importlib import import_module
+    import socketserver
+    import threading
+
+    from alldays import available_days
+    from utils import day_module, read_data
+    import cache
+
+    cache.parse_memory_size = 64
+    modules = {x: import_module(day_module(x)) for x in available_days()}
+
+    def solve(request: Dict[str, Any]) -> Dict[str, Any]:
+        day_num = int(request["day"])
+        if day_num not in modules:
+            raise ValueError(f"Unknown day {day_num}")
+        if "text" in request:
+            text = request["text"]
+        elif "path" in request:
+            text = Path(request["path"]).read_text()
+        else:
+            text = read_data(day_num)
+        start = time.perf_counter()
+        answers = modules[day_num].solve(text)
+        elapsed = time.perf_counter() - start
+        return {
+            "ok": True,
+            "day": day_num,
+            "answers": [None if x is None else str(x) for x in answers],
+            "elapsed": elapsed,
+        }
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            for line in self.rfile:
+                try:
+                    request = json.loads(line)
+                    if request.get("shutdown"):
+                        response = {"ok": True}
+                        # shutdown() blocks until serve_forever() returns, so it can't run on this thread
+                        threading.Thread(target=self.server.shutdown).start()
+                    else:
+                        response = solve(request)
+                except Exception as e:
+                    response = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+                self.wfile.write(json.dumps(response).encode() + b"\n")
+                self.wfile.flush()
+
+    socket_path.parent.mkdir(parents=True, exist_ok=True)
+    socket_path.unlink(missing_ok=True)
+    with socketserver.UnixStreamServer(str(socket_path), Handler) as server:
+        print(f"Serving {len(modules)} days on {socket_path}")
+        try:
+            server.serve_forever()
+        finally:
+            socket_path.unlink(missing_ok=True)
+
+
+def request(socket_path: Path, payload: Dict[str, Any]) -> Dict[str, Any]:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(str(socket_path))
+        client.sendall(json.dumps(payload).encode() + b"\n")
+        with client.makefile("rb") as response:
+            return json.loads(response.readline())
+
+
+def solve(socket_path: Path, day_num: int, text: Optional[str] = None, path: Optional[Path] = None) -> Dict[str, Any]:
+    payload: Dict[str, Any] = {"day": day_num}
+    if text is not None:
+        payload["text"] = text
+    elif path is not None:
+        # The daemon has its own working directory, so send it something it can find
+        payload["path"] = str(path.resolve())
+    return request(socket_path, payload)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Warm solver daemon and its client")
+    parser.add_argument("--socket", type=Path, default=DEFAULT_SOCKET, help="Unix socket to serve/connect on")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("serve", help="start the daemon in the foreground")
+    commands.add_parser("shutdown", help="stop a running daemon")
+    solve_parser = commands.add_parser("solve", help="ask the daemon to solve a day")
+    solve_parser.add_argument("day", type=int)
+    source = solve_parser.add_mutually_exclusive_group()
+    source.add_argument("--path", type=Path, help="input file to solve (default: the day's own input)")
+    source.add_argument("--stdin", action="store_true", help="read the input text from stdin")
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        serve(args.socket)
+    elif args.command == "shutdown":
+        request(args.socket, {"shutdown": True})
+    else:
+        start = time.perf_counter()
+        response = solve(args.socket, args.day, sys.stdin.read() if args.stdin else None, args.path)
+        round_trip = time.perf_counter() - start
+        if not response["ok"]:
+            sys.exit(f"Error: {response['error']}")
+        for part, answer in zip(("one", "two"), response["answers"]):
+            if answer is not None:
+                print(f"Part {part}: {answer}")
+        print(f"Solve time: {response['elapsed']}")
+        print(f"Round trip: {round_trip}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,587 @@
+from collections import defaultdict
+from fractions import Fraction
+from math import lcm
+from typing import Callable, DefaultDict, Dict, List, Optional, Set, Tuple
+from pathlib import Path
+import argparse
+import builtins
+import json
+import keyword
+import operator
+import random
+import string
+
+# Seedable, size-parameterised puzzle inputs for every day. What "size" scales is different for
+# each day and is noted on each generator; a few days are pinned to a fixed shape by their solver.
+
+Generator = Callable[[int, random.Random], str]
+GENERATORS: Dict[int, Generator] = {}
+
+
+def generator(day: int) -> Callable[[Generator], Generator]:
+    def register(func: Generator) -> Generator:
+        GENERATORS[day] = func
+        return func
+    return register
+
+
+def generate(day: int, size: int, seed: int = 0) -> str:
+    return GENERATORS[day](size, random.Random(seed))
+
+
+def random_name(rng: random.Random, length: int) -> str:
+    return "".join(rng.choices(string.ascii_lowercase, k=length))
+
+
+@generator(1)
+def day01(size: int, rng: random.Random) -> str:
+    # size: number of elves
+    elves = ("\n".join(str(rng.randint(1000, 60000)) for _ in range(rng.randint(1, 15))) for _ in range(size))
+    return "\n\n".join(elves)
+
+
+@generator(2)
+def day02(size: int, rng: random.Random) -> str:
+    # size: number of rounds
+    return "\n".join(f"{rng.choice('ABC')} {rng.choice('XYZ')}" for _ in range(size))
+
+
+@generator(3)
+def day03(size: int, rng: random.Random) -> str:
+    # size: number of rucksacks, rounded up to a whole group of three
+    lines = []
+    for _ in range(-(-size // 3)):
+        letters = list(string.ascii_letters)
+        rng.shuffle(letters)
+        badge, rest = letters[0], letters[1:]
+        for i in range(3):
+            # Each elf in the group gets its own letters, so the badge is the only thing they share
+            pool = rest[i * 17:(i + 1) * 17]
+            common, first_pool, second_pool = pool[0], pool[1:9], pool[9:]
+            half = rng.randint(2, 12)
+            first = [common, badge] + rng.choices(first_pool, k=half - 2)
+            second = [common] + rng.choices(second_pool, k=half - 1)
+            rng.shuffle(first)
+            rng.shuffle(second)
+            lines.append("".join(first + second))
+    return "\n".join(lines)
+
+
+@generator(4)
+def day04(size: int, rng: random.Random) -> str:
+    # size: number of assignment pairs
+    lines = []
+    for _ in range(size):
+        first, second = sorted(rng.sample(range(1, 100), 2)), sorted(rng.sample(range(1, 100), 2))
+        lines.append(f"{first[0]}-{first[1]},{second[0]}-{second[1]}")
+    return "\n".join(lines)
+
+
+@generator(5)
+def day05(size: int, rng: random.Random) -> str:
+    # size: number of move instructions (always nine stacks)
+    stacks = [rng.choices(string.ascii_uppercase, k=rng.randint(1, 8)) for _ in range(9)]
+    tallest = max(len(x) for x in stacks)
+    drawing = []
+    for level in reversed(range(tallest)):
+        drawing.append(" ".join(f"[{x[level]}]" if level < len(x) else "   " for x in stacks))
+    drawing.append(" ".join(f" {i} " for i in range(1, 10)))
+    heights = [len(x) for x in stacks]
+    moves = []
+    for _ in range(size):
+        from_stack = rng.choice([i for i, x in enumerate(heights) if x > 0])
+        to_stack = rng.choice([i for i in range(9) if i != from_stack])
+        amount = rng.randint(1, heights[from_stack])
+        heights[from_stack] -= amount
+        heights[to_stack] += amount
+        moves.append(f"move {amount} from {from_stack + 1} to {to_stack + 1}")
+    return "\n".join(drawing) + "\n\n" + "\n".join(moves)
+
+
+@generator(6)
+def day06(size: int, rng: random.Random) -> str:
+    # size: length of the signal; both markers are pushed as close to the end as possible
+    body = "".join(rng.choices("abc", k=max(size - 14, 0)))
+    return body + "".join(rng.sample("defghijklmnopqrstuvwxyz", 14))
+
+
+@generator(7)
+def day07(size: int, rng: random.Random) -> str:
+    # size: number of directories
+    children: List[List[int]] = [[] for _ in range(size)]
+    for node in range(1, size):
+        children[rng.randrange(node)].append(node)
+    names = ["/"] + [f"{random_name(rng, rng.randint(1, 8))}{x}" for x in range(1, size)]
+    lines = ["$ cd /"]
+    # Walk the tree depth-first without recursion, so deep trees don't hit the recursion limit
+    stack: List[Optional[int]] = [0]
+    while stack:
+        node = stack.pop()
+        if node is None:
+            lines.append("$ cd ..")
+            continue
+        if node != 0:
+            lines.append(f"$ cd {names[node]}")
+            stack.append(None)
+        lines.append("$ ls")
+        lines.extend(f"dir {names[x]}" for x in children[node])
+        for _ in range(rng.randint(0, 4)):
+            lines.append(f"{rng.randint(1000, 300000)} {random_name(rng, rng.randint(1, 8))}.{random_name(rng, 3)}")
+        stack.extend(reversed(children[node]))
+    return "\n".join(lines)
+
+
+@generator(8)
+def day08(size: int, rng: random.Random) -> str:
+    # size: side length of the square forest
+    return "\n".join("".join(rng.choices(string.digits, k=size)) for _ in range(size))
+
+
+@generator(9)
+def day09(size: int, rng: random.Random) -> str:
+    # size: number of rope moves
+    return "\n".join(f"{rng.choice('UDLR')} {rng.randint(1, 20)}" for _ in range(size))
+
+
+def day10_letters(rng: random.Random) -> List[str]:
+    from advent2022_day10 import ALPHABET_6
+    return rng.choices(list(ALPHABET_6), k=8)
+
+
+@generator(10)
+def day10(size: int, rng: random.Random) -> str:
+    # size is ignored: the CRT is always 40x6, so the program has to draw exactly eight real letters
+    while True:
+        rows = [x.split("\n") for x in day10_letters(rng)]
+        # None marks the gap column between letters, which the OCR never looks at
+        lit = [None if col % 5 == 4 else rows[col // 5][row][col % 5] == "█" for row in range(6) for col in range(40)]
+
+        def ok(cycle: int, x: int) -> bool:
+            return lit[cycle] is None or (abs(x - cycle % 40) <= 1) == lit[cycle]
+
+        # can_finish[i] holds every x from which cycles i..239 can be drawn correctly
+        xs = range(-1, 41)
+        can_finish: List[Set[int]] = [set() for _ in range(241)]
+        can_finish[240] = set(xs)
+        for cycle in reversed(range(240)):
+            any_next = cycle + 2 <= 240 and bool(can_finish[cycle + 2])
+            for x in xs:
+                if ok(cycle, x) and (x in can_finish[cycle + 1] or (any_next and ok(cycle + 1, x))):
+                    can_finish[cycle].add(x)
+        if 1 in can_finish[0]:
+            break
+
+    program = []
+    cycle, x = 0, 1
+    while cycle < 240:
+        options = []
+        if cycle + 2 <= 240 and ok(cycle + 1, x):
+            options.extend(("addx", new_x) for new_x in can_finish[cycle + 2] if new_x != x)
+        if x in can_finish[cycle + 1]:
+            options.append(("noop", x))
+        if not options:
+            # Only a zero-length jump fits here
+            options.append(("addx", x))
+        instruction, new_x = rng.choice(options)
+        if instruction == "noop":
+            program.append("noop")
+            cycle += 1
+        else:
+            program.append(f"addx {new_x - x}")
+            cycle, x = cycle + 2, new_x
+    return "\n".join(program)
+
+
+@generator(11)
+def day11(size: int, rng: random.Random) -> str:
+    # size: total number of starting items, spread across eight monkeys
+    divisors = rng.sample([2, 3, 5, 7, 11, 13, 17, 19, 23], 8)
+    items: List[List[int]] = [[rng.randint(50, 99)] for _ in range(8)]
+    for _ in range(max(size - 8, 0)):
+        items[rng.randrange(8)].append(rng.randint(50, 99))
+    squarer = rng.randrange(8)
+    monkeys = []
+    for i in range(8):
+        if i == squarer:
+            operation = "* old"
+        else:
+            operation = rng.choice(["*", "+"]) + f" {rng.randint(1, 19)}"
+        true_throw, false_throw = rng.sample([x for x in range(8) if x != i], 2)
+        monkeys.append(
+            f"Monkey {i}:\n"
+            f"  Starting items: {', '.join(str(x) for x in items[i])}\n"
+            f"  Operation: new = old {operation}\n"
+            f"  Test: divisible by {divisors[i]}\n"
+            f"    If true: throw to monkey {true_throw}\n"
+            f"    If false: throw to monkey {false_throw}"
+        )
+    return "\n\n".join(monkeys)
+
+
+@generator(12)
+def day12(size: int, rng: random.Random) -> str:
+    # size: side length of the square heightmap (at least 26, so the slope can climb one letter at a time)
+    size = max(size, 26)
+    rows = []
+    for y in range(size):
+        row = []
+        for x in range(size):
+            height = x * 25 // (size - 1)
+            # Random pits are always safe to step down into, so they add detours without breaking the climb
+            if rng.random() < 0.2:
+                height = rng.randint(0, height)
+            row.append(chr(ord("a") + height))
+        rows.append(row)
+    rows[size // 2][0], rows[size // 2][-1] = "S", "E"
+    return "\n".join("".join(x) for x in rows)
+
+
+def random_packet(rng: random.Random, depth: int = 0):
+    if depth >= 4 or rng.random() < 0.3:
+        return rng.randint(0, 10)
+    return [random_packet(rng, depth + 1) for _ in range(rng.randint(0, 5))]
+
+
+@generator(13)
+def day13(size: int, rng: random.Random) -> str:
+    # size: number of packet pairs
+    pairs = []
+    for _ in range(size):
+        first, second = ([random_packet(rng, 1) for _ in range(rng.randint(0, 5))] for _ in range(2))
+        pairs.append(f"{json.dumps(first, separators=(',', ':'))}\n{json.dumps(second, separators=(',', ':'))}")
+    return "\n\n".join(pairs)
+
+
+@generator(14)
+def day14(size: int, rng: random.Random) -> str:
+    # size: number of rock paths; the cave grows with it
+    spread, depth = 50 + size // 2, 20 + size
+    # A bowl under the source, so part one always has somewhere to pile sand before it spills into the abyss
+    left, right = 500 - rng.randint(2, 8), 500 + rng.randint(2, 8)
+    bottom = rng.randint(6, depth)
+    top = bottom - rng.randint(2, 4)
+    paths = [f"{left},{top} -> {left},{bottom} -> {right},{bottom} -> {right},{top}"]
+    for _ in range(size - 1):
+        x, y = rng.randint(500 - spread, 500 + spread), rng.randint(2, depth)
+        points = [(x, y)]
+        for i in range(rng.randint(1, 4)):
+            if i % 2 == 0:
+                x += rng.randint(-6, 6) or 1
+            else:
+                y = max(y + rng.randint(-6, 6), 2)
+            points.append((x, y))
+        paths.append(" -> ".join(f"{x},{y}" for x, y in points))
+    return "\n".join(paths)
+
+
+@generator(15)
+def day15(size: int, rng: random.Random) -> str:
+    # size: number of sensors. Two of them are placed one gap apart around a hidden beacon that none of the
+    # others reach, so part two always has a candidate to find.
+    limit = 4000000
+    hidden = (rng.randint(1000000, limit - 1000000), rng.randint(1000000, limit - 1000000))
+    sensors: List[Tuple[int, int, int, int]] = []
+    for offset in (-rng.randint(10000, 500000), rng.randint(10000, 500000)):
+        sensor_x, radius = hidden[0] + offset, abs(offset) - 1
+        sensors.append((sensor_x, hidden[1], sensor_x, hidden[1] + radius))
+    while len(sensors) < size:
+        sensor_x, sensor_y = rng.randint(0, limit), rng.randint(0, limit)
+        radius = rng.randint(1000, 800000)
+        if abs(sensor_x - hidden[0]) + abs(sensor_y - hidden[1]) <= radius:
+            continue
+        beacon_dx = rng.randint(-radius, radius)
+        beacon_dy = rng.choice([-1, 1]) * (radius - abs(beacon_dx))
+        sensors.append((sensor_x, sensor_y, sensor_x + beacon_dx, sensor_y + beacon_dy))
+    rng.shuffle(sensors)
+    return "\n".join(
+        f"Sensor at x={sx}, y={sy}: closest beacon is at x={bx}, y={by}" for sx, sy, bx, by in sensors
+    )
+
+
+@generator(16)
+def day16(size: int, rng: random.Random) -> str:
+    # size: number of valves (between 3 and 676). Roughly a quarter have a flow rate, capped at 15 so the search stays
+    # tractable, and at least two do, since part two needs something for each of you and the elephant to open.
+    size = min(max(size, 3), 676)
+    all_names = [a + b for a in string.ascii_uppercase for b in string.ascii_uppercase if a + b != "AA"]
+    names = ["AA"] + rng.sample(all_names, size - 1)
+    flowing = set(rng.sample(names[1:], min(15, max(len(names) // 4, 2))))
+    tunnels: Dict[str, Set[str]] = {x: set() for x in names}
+    # A random tree keeps everything connected, then a few extra tunnels add loops
+    for i, name in enumerate(names[1:], start=1):
+        other = names[rng.randrange(i)]
+        tunnels[name].add(other)
+        tunnels[other].add(name)
+    for _ in range(len(names) // 3):
+        first, second = rng.sample(names, 2)
+        tunnels[first].add(second)
+        tunnels[second].add(first)
+    lines = []
+    for name in names:
+        rate = rng.randint(1, 25) if name in flowing else 0
+        targets = sorted(tunnels[name])
+        if len(targets) == 1:
+            lines.append(f"Valve {name} has flow rate={rate}; tunnel leads to valve {targets[0]}")
+        else:
+            lines.append(f"Valve {name} has flow rate={rate}; tunnels lead to valves {', '.join(targets)}")
+    return "\n".join(lines)
+
+
+@generator(17)
+def day17(size: int, rng: random.Random) -> str:
+    # size: length of the jet pattern
+    return "".join(rng.choices("<>", k=size))
+
+
+@generator(18)
+def day18(size: int, rng: random.Random) -> str:
+    # size: number of lava cubes, packed into a box about twice their volume
+    side = round((size * 2) ** (1 / 3)) + 1
+    cubes: Set[Tuple[int, int, int]] = set()
+    while len(cubes) < size:
+        cubes.add((rng.randrange(side), rng.randrange(side), rng.randrange(side)))
+    return "\n".join(f"{x},{y},{z}" for x, y, z in cubes)
+
+
+@generator(19)
+def day19(size: int, rng: random.Random) -> str:
+    # size: number of blueprints. Costs sit at the cheap end of the real inputs' ranges: blueprints that can build
+    # geode robots early let the search prune hard, where mid-range ones can take half a minute each in part two.
+    lines = []
+    for i in range(1, size + 1):
+        lines.append(
+            f"Blueprint {i}: Each ore robot costs {rng.randint(2, 3)} ore. "
+            f"Each clay robot costs {rng.randint(2, 3)} ore. "
+            f"Each obsidian robot costs {rng.randint(2, 3)} ore and {rng.randint(4, 10)} clay. "
+            f"Each geode robot costs {rng.randint(2, 3)} ore and {rng.randint(4, 10)} obsidian."
+        )
+    return "\n".join(lines)
+
+
+@generator(20)
+def day20(size: int, rng: random.Random) -> str:
+    # size: how many numbers are in the file, bumped up past any count that divides 1000 (every grove coordinate would
+    # land on the zero itself otherwise); exactly one of them is zero
+    count = max(size, 1)
+    while 1000 % count == 0:
+        count += 1
+    numbers = [rng.choice([-1, 1]) * rng.randint(1, 10000) for _ in range(max(count - 1, 0))]
+    numbers.insert(rng.randint(0, len(numbers)), 0)
+    return "\n".join(str(x) for x in numbers)
+
+
+DAY21_OPERATORS = {"+": operator.add, "-": operator.sub, "*": operator.mul, "/": operator.truediv}
+
+
+def day21_values(lines: List[str], humn: int) -> Dict[str, Fraction]:
+    # Exact values for every monkey, worked out without recursion since the humn chain can get deep
+    jobs = dict(x.split(": ") for x in lines)
+    jobs["humn"] = str(humn)
+    values: Dict[str, Fraction] = {}
+    stack = ["root"]
+    while stack:
+        job = jobs[stack[-1]].split(" ")
+        if len(job) == 1:
+            values[stack.pop()] = Fraction(int(job[0]))
+            continue
+        pending = [x for x in (job[0], job[2]) if x not in values]
+        if pending:
+            stack.extend(pending)
+            continue
+        values[stack.pop()] = DAY21_OPERATORS[job[1]](values[job[0]], values[job[2]])
+    return values
+
+
+@generator(21)
+def day21(size: int, rng: random.Random) -> str:
+    # size: roughly the number of monkeys. humn's target value is picked first and root's humn side is built up
+    # from it one exact step at a time, so part two always solves back to that integer. Everything stays positive,
+    # and every division is exact for humn's listed value too, so part one is a positive integer as well.
+    reserved = set(dir(builtins)) | set(keyword.kwlist) | {"root", "humn"}
+    names: Set[str] = set()
+
+    def new_name() -> str:
+        while (name := random_name(rng, 4)) in names or name in reserved:
+            pass
+        names.add(name)
+        return name
+
+    lines = []
+    leaves = max(size // 2, 2)
+    # The solver hands humn's side to sympy as one nested expression, which Python's parser caps at 200 levels deep,
+    # so the chain stops growing at about the length real inputs have
+    chain_length = min(max(leaves // 4, 1), 70)
+    subtrees: List[Tuple[str, int]] = []
+    for _ in range(leaves):
+        name, value = new_name(), rng.randint(1, 20)
+        lines.append(f"{name}: {value}")
+        subtrees.append((name, value))
+    # Merge the constant leaves until there's one left for each step of humn's chain, plus one for root's other side
+    while len(subtrees) > chain_length + 1:
+        rng.shuffle(subtrees)
+        (first, first_value), (second, second_value) = subtrees.pop(), subtrees.pop()
+        options = [("+", first_value + second_value)]
+        if first_value > second_value:
+            options.append(("-", first_value - second_value))
+        if first_value * second_value < 2**40:
+            options.append(("*", first_value * second_value))
+        if first_value % second_value == 0:
+            options.append(("/", first_value // second_value))
+        op, value = rng.choice(options)
+        name = new_name()
+        lines.append(f"{name}: {first} {op} {second}")
+        subtrees.append((name, value))
+
+    # humn's side of root, tracked with both the target and the listed value for humn at once
+    target, listed = rng.randint(1, 5000), rng.randint(1, 5000)
+    lines.append(f"humn: {listed}")
+    chain, values = "humn", (target, listed)
+    for other, constant in subtrees[:-1]:
+        options = [
+            (f"{chain} + {other}", tuple(x + constant for x in values)),
+            (f"{other} + {chain}", tuple(x + constant for x in values)),
+        ]
+        if all(x > constant for x in values):
+            options.append((f"{chain} - {other}", tuple(x - constant for x in values)))
+        if all(x < constant for x in values):
+            options.append((f"{other} - {chain}", tuple(constant - x for x in values)))
+        if all(x * constant < 2**40 for x in values):
+            options.append((f"{chain} * {other}", tuple(x * constant for x in values)))
+            options.append((f"{other} * {chain}", tuple(x * constant for x in values)))
+        if all(x % constant == 0 for x in values):
+            options.append((f"{chain} / {other}", tuple(x // constant for x in values)))
+        job, values = rng.choice(options)
+        chain = new_name()
+        lines.append(f"{chain}: {job}")
+
+    # Then the other side gets topped up (or cut down) to match the humn side at humn's target value
+    other, constant = subtrees[-1]
+    if constant != values[0]:
+        adjustment, balanced = new_name(), new_name()
+        lines.append(f"{adjustment}: {abs(values[0] - constant)}")
+        lines.append(f"{balanced}: {other} {'+' if constant < values[0] else '-'} {adjustment}")
+        other = balanced
+    sides = [chain, other]
+    rng.shuffle(sides)
+    lines.append(f"root: {sides[0]} + {sides[1]}")
+
+    part_one_values, part_two_values = day21_values(lines, listed), day21_values(lines, target)
+    assert all(x.denominator == 1 for x in part_one_values.values()) and part_one_values["root"] > 0
+    # The humn side is linear in humn with a non-zero slope, so target is the one and only answer to part two
+    assert part_two_values[chain] == part_two_values[other] and part_two_values[chain].denominator == 1
+    rng.shuffle(lines)
+    return "\n".join(lines)
+
+
+@generator(22)
+def day22(size: int, rng: random.Random) -> str:
+    # size: number of path steps. The cube net is fixed to the 50x50 layout the solver has hardcoded.
+    faces = {(1, 0), (2, 0), (1, 1), (0, 2), (1, 2), (0, 3)}
+    rows = []
+    for y in range(200):
+        row = "".join(
+            (" " if (x // 50, y // 50) not in faces else "#" if rng.random() < 0.1 else ".") for x in range(150)
+        )
+        rows.append(row.rstrip())
+    # The path starts at the top-left corner of the first face, so that has to be open
+    rows[0] = rows[0][:50] + "." + rows[0][51:]
+    path = str(rng.randint(1, 50))
+    for _ in range(size):
+        path += rng.choice("LR") + str(rng.randint(1, 50))
+    return "\n".join(rows) + "\n\n" + path
+
+
+@generator(23)
+def day23(size: int, rng: random.Random) -> str:
+    # size: side length of the starting square; about half the tiles have an elf
+    return "\n".join("".join(rng.choice("#.") for _ in range(size)) for _ in range(size))
+
+
+def day24_crossable(rows: List[str], reverse: bool = False) -> bool:
+    # Blizzards follow the solver's rules: they wrap within the inner valley, so it repeats every lcm(width, height)
+    # minutes. Waiting at the start is always safe, so checking from minute 0 covers every starting minute too.
+    inner = [x[1:-1] for x in rows[1:-1]]
+    width, height = len(inner[0]), len(inner)
+    period = lcm(width, height)
+    lanes: Dict[str, DefaultDict[int, Set[int]]] = {x: defaultdict(set) for x in "<>^v"}
+    for y, row in enumerate(inner):
+        for x, char in enumerate(row):
+            if char in "<>":
+                lanes[char][y].add(x)
+            elif char in "^v":
+                lanes[char][x].add(y)
+    start, end = (0, -1), (width - 1, height)
+    if reverse:
+        start, end = end, start
+
+    def clear(x: int, y: int, minute: int) -> bool:
+        if not (0 <= x < width and 0 <= y < height):
+            return (x, y) in (start, end)
+        return not (
+            (x + minute) % width in lanes["<"][y]
+            or (x - minute) % width in lanes[">"][y]
+            or (y + minute) % height in lanes["^"][x]
+            or (y - minute) % height in lanes["v"][x]
+        )
+
+    frontier, seen = {start}, {(start, 0)}
+    minute = 0
+    while frontier:
+        if end in frontier:
+            return True
+        minute += 1
+        frontier = {
+            (next_x, next_y)
+            for x, y in frontier
+            for next_x, next_y in ((x, y), (x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1))
+            if clear(next_x, next_y, minute) and ((next_x, next_y), minute % period) not in seen
+        }
+        seen.update((x, minute % period) for x in frontier)
+    return False
+
+
+@generator(24)
+def day24(size: int, rng: random.Random) -> str:
+    # size: valley width; the valley is a quarter as tall. No vertical blizzards share a column with the entrance or
+    # exit, same as the real inputs, and valleys that can't be crossed both ways get re-rolled.
+    width, height = max(size, 3), max(size // 4, 3)
+    while True:
+        rows = ["#." + "#" * width]
+        for _ in range(height):
+            row = ""
+            for x in range(width):
+                if rng.random() >= 0.3:
+                    row += "."
+                elif x in (0, width - 1):
+                    row += rng.choice("<>")
+                else:
+                    row += rng.choice("<>^v")
+            rows.append(f"#{row}#")
+        rows.append("#" * width + ".#")
+        if day24_crossable(rows) and day24_crossable(rows, reverse=True):
+            return "\n".join(rows)
+
+
+@generator(25)
+def day25(size: int, rng: random.Random) -> str:
+    # size: number of SNAFU numbers
+    from advent2022_day25 import int_to_snafu
+    return "\n".join(int_to_snafu(rng.randint(1, 10**12)) for _ in range(size))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic puzzle input")
+    parser.add_argument("day", type=int)
+    parser.add_argument("size", type=int)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-o", "--output", type=Path, help="write to a file instead of stdout")
+    args = parser.parse_args()
+    data = generate(args.day, args.size, args.seed)
+    if args.output:
+        args.output.write_text(data)
+    else:
+        print(data)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,159 @@
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Tuple
+import argparse
+import json
+import lzma
+import mmap
+import os
+import struct
+
+from utils import day_module, decode_input, input_path
+
+# Many puzzle inputs packed into one file, each addressed by (day, input id), so a batch over thousands of inputs
+# opens and maps one file instead of opening each input. The layout is a fixed header, the entries back to back,
+# then a JSON index giving each entry's offset, length and whether it's lzma-compressed. Uncompressed entries are
+# read straight out of the map without copying anything else.
+
+MAGIC = b"AOCINPT1"
+# Magic, then the offset and length of the index
+HEADER = struct.Struct("<8sQQ")
+DEFAULT_STORE = Path("inputs/inputs.pack")
+# What each day's own input (the one in inputs/) is stored as
+DEFAULT_ID = "input"
+
+
+class Entry(NamedTuple):
+    offset: int
+    length: int
+    compressed: bool
+
+
+class InputStore:
+    def __init__(self, path: Path):
+        self.path = path
+        with path.open("rb") as store_file:
+            self._map = mmap.mmap(store_file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, index_offset, index_length = HEADER.unpack_from(self._map)
+        if magic != MAGIC:
+            raise ValueError(f"{path} isn't an input store")
+        index = json.loads(self._map[index_offset:index_offset + index_length])
+        self.index: Dict[Tuple[int, str], Entry] = {
+            (day, input_id): Entry(offset, length, compressed) for day, input_id, offset, length, compressed in index
+        }
+
+    def __contains__(self, key: Tuple[int, str]) -> bool:
+        return key in self.index
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def ids(self, day: int) -> List[str]:
+        return [input_id for entry_day, input_id in self.index if entry_day == day]
+
+    def view(self, day: int, input_id: str = DEFAULT_ID) -> memoryview:
+        """The stored bytes of an entry, without copying them out of the map (so uncompressed entries only)."""
+        entry = self.index[(day, input_id)]
+        if entry.compressed:
+            raise ValueError(f"Day {day} input {input_id!r} is compressed, so it has to be read with read_bytes()")
+        return memoryview(self._map)[entry.offset:entry.offset + entry.length]
+
+    def read_bytes(self, day: int, input_id: str = DEFAULT_ID) -> bytes:
+        entry = self.index[(day, input_id)]
+        data = self._map[entry.offset:entry.offset + entry.length]
+        return lzma.decompress(data) if entry.compressed else data
+
+    def read_text(self, day: int, input_id: str = DEFAULT_ID) -> str:
+        return decode_input(self.read_bytes(day, input_id))
+
+    def close(self):
+        self._map.close()
+
+    def __enter__(self) -> "InputStore":
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+
+# Stores already opened in this process, along with the (mtime, size) they were opened at
+_OPEN_STORES: Dict[Path, Tuple[Tuple[int, int], InputStore]] = {}
+
+
+def open_store(path: Path = DEFAULT_STORE) -> InputStore:
+    """A shared, already open store, reopened if the file has been rewritten since."""
+    stat = path.stat()
+    version = stat.st_mtime_ns, stat.st_size
+    cached = _OPEN_STORES.get(path)
+    if cached is None or cached[0] != version:
+        # Anything still holding a view into an old map keeps it alive, so it's left for the GC rather than closed
+        cached = _OPEN_STORES[path] = (version, InputStore(path))
+    return cached[1]
+
+
+def write_store(path: Path, entries: Iterable[Tuple[int, str, bytes]], compress: bool = False) -> int:
+    """Pack (day, input id, data) entries into a new store at path, returning how many were written."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    index = []
+    # Written next to the destination and renamed over it, so readers never see half a store
+    temp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with temp_path.open("wb") as store_file:
+        store_file.write(b"\0" * HEADER.size)
+        for day, input_id, data in entries:
+            if compress:
+                data = lzma.compress(data)
+            index.append((day, input_id, store_file.tell(), len(data), compress))
+            store_file.write(data)
+        index_offset = store_file.tell()
+        raw_index = json.dumps(index, separators=(",", ":")).encode()
+        store_file.write(raw_index)
+        store_file.seek(0)
+        store_file.write(HEADER.pack(MAGIC, index_offset, len(raw_index)))
+    os.replace(temp_path, path)
+    return len(index)
+
+
+def day_inputs(days: Iterable[int]) -> Iterator[Tuple[int, str, bytes]]:
+    for day in days:
+        path = input_path(day_module(day))
+        if path.exists():
+            yield day, DEFAULT_ID, path.read_bytes()
+
+
+def directory_inputs(day: int, directory: Path, pattern: str = "*") -> Iterator[Tuple[int, str, bytes]]:
+    # Stored under their file names, which is also what batch.py reports them as
+    for path in sorted(x for x in directory.glob(pattern) if x.is_file()):
+        yield day, path.name, path.read_bytes()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pack puzzle inputs into a single indexed file, or list one")
+    parser.add_argument("--store", type=Path, default=DEFAULT_STORE, help="the packed store to write or read")
+    commands = parser.add_subparsers(dest="command", required=True)
+    pack_parser = commands.add_parser("pack", help="pack every day's input, plus any directories of extra inputs")
+    pack_parser.add_argument(
+        "--add", action="append", nargs=2, default=[], metavar=("DAY", "DIR"),
+        help="also pack every file in DIR as inputs for DAY (repeatable)",
+    )
+    pack_parser.add_argument("--pattern", default="*", help="glob for input files within each --add directory")
+    pack_parser.add_argument("--compress", action="store_true", help="lzma-compress each entry")
+    pack_parser.add_argument("--no-days", action="store_true", help="leave out the days' own inputs")
+    commands.add_parser("list", help="list what's in the store")
+    args = parser.parse_args()
+
+    if args.command == "pack":
+        from itertools import chain
+        from alldays import available_days
+
+        sources = [] if args.no_days else [day_inputs(available_days())]
+        sources += [directory_inputs(int(day), Path(directory), args.pattern) for day, directory in args.add]
+        count = write_store(args.store, chain.from_iterable(sources), args.compress)
+        print(f"Packed {count} inputs into {args.store} ({args.store.stat().st_size / 2**10:.1f}KB)")
+    else:
+        with InputStore(args.store) as store:
+            for (day, input_id), entry in sorted(store.index.items()):
+                compressed = " (compressed)" if entry.compressed else ""
+                print(f"Day {day}: {input_id} {entry.length} bytes{compressed}")
+
+
+if __name__ == '__main__':
+    main()
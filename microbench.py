@@ -0,0 +1,211 @@
+from fnmatch import fnmatch
+from itertools import cycle
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple, Tuple
+import argparse
+import json
+import math
+import platform
+import sys
+import timeit
+
+from alldays import sample_stats, compare_medians
+from utils import read_data, BaseCoord
+
+# Times the small building blocks the days lean on, one at a time, so a change to a shared primitive shows up as a
+# change in its own number rather than as noise in a whole day's runtime. Each case sets up a workload from the real
+# puzzle input once, then every timed call runs that same workload a fixed number of times, so runs stay comparable.
+
+# A case's setup returns the workload to time, and how many of the primitive's operations one call of it does
+Workload = Tuple[Callable[[], Any], int]
+
+
+class Case(NamedTuple):
+    name: str
+    setup: Callable[[], Workload]
+    # Calls per timed sample, picked so a sample takes a few milliseconds
+    number: int
+
+
+CASES: Dict[str, Case] = {}
+
+
+def case(name: str, number: int) -> Callable[[Callable[[], Workload]], Callable[[], Workload]]:
+    def register(func: Callable[[], Workload]) -> Callable[[], Workload]:
+        CASES[name] = Case(name, func, number)
+        return func
+    return register
+
+
+@case("coord.add", number=20000)
+def coord_add() -> Workload:
+    first, second = BaseCoord(x=3, y=4), BaseCoord(x=-1, y=1)
+    return lambda: first + second, 1
+
+
+@case("coord.neighbors", number=5000)
+def coord_neighbors() -> Workload:
+    coord = BaseCoord(x=3, y=4)
+    return lambda: list(coord.neighbors()), 1
+
+
+@case("day09.catch_up", number=200)
+def day09_catch_up() -> Workload:
+    from advent2022_day09 import Coord
+    # Every spot a knot can be in relative to the one ahead of it after a single step
+    pairs = [(Coord(0, 0), Coord(x=x, y=y)) for x in range(-2, 3) for y in range(-2, 3)]
+
+    def run():
+        for tail, head in pairs:
+            tail.catch_up(head)
+    return run, len(pairs)
+
+
+@case("day11.handle_items", number=200)
+def day11_handle_items() -> Workload:
+    from advent2022_day11 import Monkey
+    monkeys = [Monkey(x) for x in read_data(11).split("\n\n")]
+    # Part two's setup, where worry levels stay bounded, so every round does the same amount of work
+    lcm = math.prod(x.test_div for x in monkeys)
+    for monkey in monkeys:
+        monkey.lcm = lcm
+    items = sum(len(x.items) for x in monkeys)
+
+    def run():
+        for monkey in monkeys:
+            monkey.handle_items(monkeys)
+    # Items can be thrown on to a later monkey in the same round, so this undercounts a little, but it's consistent
+    return run, items
+
+
+@case("day13.packet_cmp", number=20)
+def day13_packet_cmp() -> Workload:
+    from advent2022_day13 import Packet
+    packets = [Packet(json.loads(x)) for x in read_data(13).splitlines() if x]
+    pairs = list(zip(packets[::2], packets[1::2]))
+
+    def run():
+        for first, second in pairs:
+            first.cmp(second)
+    return run, len(pairs)
+
+
+@case("day17.drop_shape", number=5)
+def day17_drop_shape() -> Workload:
+    from advent2022_day17 import drop_shape, shapes, JET_DIRECTIONS
+    from utils import CoordSet
+    jets = [JET_DIRECTIONS[x] for x in read_data(17)]
+    rocks = 200
+
+    def run():
+        # A fresh board each time, so every call drops onto the same towers
+        board, height = CoordSet(), 0
+        jet_directions = cycle(jets)
+        shape_order = shapes()
+        for _ in range(rocks):
+            board, height = drop_shape(board, height, next(shape_order), jet_directions)
+    return run, rocks
+
+
+@case("day24.occupied", number=5)
+def day24_occupied() -> Workload:
+    from advent2022_day24 import Blizzards
+    blizzards = Blizzards(read_data(24))
+    cells = [BaseCoord(x=x, y=y) for y in range(blizzards.height) for x in range(blizzards.width)]
+
+    def run():
+        for depth in range(3):
+            for cell in cells:
+                blizzards.occupied(cell, depth)
+    return run, 3 * len(cells)
+
+
+@case("day25.snafu_to_int", number=100)
+def day25_snafu_to_int() -> Workload:
+    from advent2022_day25 import snafu_to_int
+    snafus = read_data(25).splitlines()
+
+    def run():
+        for snafu in snafus:
+            snafu_to_int(snafu)
+    return run, len(snafus)
+
+
+@case("day25.int_to_snafu", number=100)
+def day25_int_to_snafu() -> Workload:
+    from advent2022_day25 import snafu_to_int, int_to_snafu
+    values = [snafu_to_int(x) for x in read_data(25).splitlines()]
+
+    def run():
+        for value in values:
+            int_to_snafu(value)
+    return run, len(values)
+
+
+class MicroStats(NamedTuple):
+    name: str
+    samples: int
+    # All per single operation of the primitive
+    min_ns: float
+    median_ns: float
+    p95_ns: float
+    stddev_ns: float
+
+
+def measure(bench: Case, repeat: int, warmup: int) -> MicroStats:
+    run, ops = bench.setup()
+    timer = timeit.Timer(run)
+    for _ in range(warmup):
+        timer.timeit(bench.number)
+    per_op = (x * 1e9 / (bench.number * ops) for x in timer.repeat(repeat, bench.number))
+    return MicroStats(bench.name, *sample_stats(per_op))
+
+
+def save_results(path: Path, results: List[MicroStats]):
+    path.write_text(json.dumps({
+        "python": platform.python_version(),
+        "cases": {x.name: x._asdict() for x in results},
+    }, indent=2))
+
+
+def compare_to_saved(path: Path, results: List[MicroStats], threshold: float) -> List[str]:
+    return compare_medians(
+        path, "cases", {x.name: x.median_ns for x in results}, threshold,
+        label=str, format_ns=lambda ns: f"{ns:.1f}ns",
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the shared primitives and hot helpers in isolation")
+    parser.add_argument("--repeat", type=int, default=20, help="timed samples per case")
+    parser.add_argument("--warmup", type=int, default=1, help="untimed samples before timing each case")
+    parser.add_argument("--save", type=Path, metavar="FILE", help="write the results to a JSON file")
+    parser.add_argument("--compare", type=Path, metavar="FILE", help="compare against results saved with --save")
+    parser.add_argument("--threshold", type=float, default=0.05, help="median change to flag when comparing")
+    parser.add_argument("--list", action="store_true", help="list the cases and exit")
+    parser.add_argument("cases", nargs="*", help="case names or glob patterns to run (default: all)")
+    args = parser.parse_args()
+
+    if args.list:
+        print("\n".join(CASES))
+        return
+    selected = [x for x in CASES.values() if not args.cases or any(fnmatch(x.name, y) for y in args.cases)]
+    if not selected:
+        sys.exit(f"No cases match {' '.join(args.cases)}")
+    results = []
+    for bench in selected:
+        stats = measure(bench, args.repeat, args.warmup)
+        results.append(stats)
+        print(
+            f"{stats.name}: min {stats.min_ns:.1f}ns, median {stats.median_ns:.1f}ns, p95 {stats.p95_ns:.1f}ns, "
+            f"stddev {stats.stddev_ns:.1f}ns per op ({stats.samples} samples of {bench.number})"
+        )
+    if args.save:
+        save_results(args.save, results)
+    # Exit non-zero on slowdowns, so this can gate a change the same way alldays.py --compare does
+    if args.compare and compare_to_saved(args.compare, results, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
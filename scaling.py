@@ -0,0 +1,119 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, NamedTuple, Optional
+from pathlib import Path
+import argparse
+import csv
+import json
+import math
+import statistics
+
+from alldays import RunOptions, run_day, available_days
+
+# Runs each day against generated inputs of geometrically growing size and fits the growth exponent k in
+# time ~ size^k (and the same for peak memory), so changes to the scaling class show up as a changed k.
+
+# Starting sizes that keep the smallest run well under a second; what "size" means is per day, see generators.py.
+# Day 19 is the exception, since part two's 32-minute search takes around a second even for a single blueprint.
+START_SIZES = {
+    1: 1000, 2: 10000, 3: 3000, 4: 10000, 5: 1000, 6: 10000, 7: 500, 8: 50, 9: 500, 11: 20, 12: 30, 13: 100,
+    14: 20, 15: 10, 16: 20, 17: 1000, 18: 500, 19: 1, 20: 500, 21: 200, 22: 500, 23: 10, 24: 10, 25: 1000,
+}
+# Day 10's CRT is a fixed size, so there's nothing to scale
+FIXED_SIZE_DAYS = {10}
+
+
+class Sample(NamedTuple):
+    day: int
+    size: int
+    seconds: float
+    peak_bytes: int
+
+
+class Fit(NamedTuple):
+    day: int
+    time_exponent: Optional[float]
+    memory_exponent: Optional[float]
+
+
+def warm_peak_alloc(day_num: int, options: RunOptions) -> int:
+    # run_day() traces the day's import and the heavy libraries it loads on first use too, which cost the same at
+    # every size and would drag the fitted exponent toward 0. An untraced run first gets all of that out of the way.
+    run_day(day_num, options._replace(memory=False))
+    return run_day(day_num, options).peak_alloc
+
+
+def measure(day_num: int, size: int, seed: int, repeats: int) -> Sample:
+    def fresh_run(func, options: RunOptions):
+        # A new process per run, since some days read their input at import and RSS only ever grows
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            return executor.submit(func, day_num, options).result()
+
+    seconds = min(fresh_run(run_day, RunOptions(generate_size=size, seed=seed)).elapsed for _ in range(repeats))
+    # Memory gets its own run so tracemalloc's overhead doesn't leak into the timings
+    peak = fresh_run(warm_peak_alloc, RunOptions(memory=True, generate_size=size, seed=seed))
+    return Sample(day_num, size, seconds, peak)
+
+
+def growth_exponent(sizes: List[int], values: List[float]) -> Optional[float]:
+    points = [(math.log(s), math.log(v)) for s, v in zip(sizes, values) if v > 0]
+    if len(points) < 2:
+        return None
+    return statistics.linear_regression([x for x, _ in points], [y for _, y in points]).slope
+
+
+def scale_day(day_num: int, factor: float, steps: int, max_seconds: float, seed: int, repeats: int) -> List[Sample]:
+    samples = []
+    size = START_SIZES[day_num]
+    for _ in range(steps):
+        sample = measure(day_num, size, seed, repeats)
+        samples.append(sample)
+        print(f"Day {day_num}: size {size}: {sample.seconds:.4f}s, peak {sample.peak_bytes / 2**20:.2f}MB")
+        # The next step would take at least factor times longer, so stop before it blows the budget
+        if sample.seconds * factor > max_seconds:
+            break
+        size = round(size * factor)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fit runtime/memory growth exponents against input size")
+    parser.add_argument("--factor", type=float, default=2, help="size multiplier between steps")
+    parser.add_argument("--steps", type=int, default=5, help="maximum sizes to try per day")
+    parser.add_argument("--max-seconds", type=float, default=30, help="stop growing a day once a run gets this slow")
+    parser.add_argument("--repeats", type=int, default=3, help="timed runs per size (the fastest is kept)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--csv", type=Path, default=Path("scaling.csv"), help="where to write every sample")
+    parser.add_argument("--json", type=Path, default=Path("scaling.json"), help="where to write samples and fits")
+    parser.add_argument("days", type=int, nargs="*", help="days to scale (default: all)")
+    args = parser.parse_args()
+
+    days = [x for x in (args.days or available_days()) if x not in FIXED_SIZE_DAYS]
+    samples: Dict[int, List[Sample]] = {}
+    fits: List[Fit] = []
+    for day_num in days:
+        samples[day_num] = scale_day(day_num, args.factor, args.steps, args.max_seconds, args.seed, args.repeats)
+        sizes = [x.size for x in samples[day_num]]
+        fits.append(Fit(
+            day_num,
+            growth_exponent(sizes, [x.seconds for x in samples[day_num]]),
+            growth_exponent(sizes, [x.peak_bytes for x in samples[day_num]]),
+        ))
+
+    print("Growth exponents (time ~ size^k):")
+    for fit in fits:
+        time_k = "n/a" if fit.time_exponent is None else f"{fit.time_exponent:.2f}"
+        memory_k = "n/a" if fit.memory_exponent is None else f"{fit.memory_exponent:.2f}"
+        print(f"Day {fit.day}: time k={time_k}, memory k={memory_k}")
+
+    with args.csv.open("w", newline="") as csv_file:
+        writer = csv.writer(csv_file)
+        writer.writerow(Sample._fields)
+        writer.writerows(x for day_samples in samples.values() for x in day_samples)
+    args.json.write_text(json.dumps({
+        "fits": [x._asdict() for x in fits],
+        "samples": [x._asdict() for day_samples in samples.values() for x in day_samples],
+    }, indent=2))
+
+
+if __name__ == '__main__':
+    main()
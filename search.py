@@ -0,0 +1,218 @@
+from collections import deque
+from typing import Callable, Deque, Dict, Hashable, Iterable, Iterator, List, NamedTuple, Optional, Tuple, TypeVar
+import heapq
+import itertools
+
+from utils import METRICS
+
+# Graph searches shared by the days. Each one takes a successors function that says where a state can go next, and a
+# key function that says which states count as the same place for visited tracking. Keys are the only thing kept per
+# visited state, so returning something small (e.g. utils.pack() of a coord) keeps big searches compact.
+
+S = TypeVar("S")
+Key = Callable[[S], Hashable]
+
+
+def _identity(state: S) -> S:
+    return state
+
+
+class SearchLimitExceeded(Exception):
+    """A search popped more states than its max_states allowed."""
+
+
+class SearchResult(NamedTuple):
+    # The first goal state reached and what it cost to get there, or None for both if no goal was reached
+    goal: Optional[S]
+    cost: Optional[int]
+    # The cost to reach every key the search settled
+    distances: Dict[Hashable, int]
+
+
+class BestFound(NamedTuple):
+    state: Optional[S]
+    value: int
+
+
+class _Tally:
+    """The popped/pruned/queue size counters every search reports, kept in locals until the search is done."""
+
+    def __init__(self, metrics: Optional[str], max_states: Optional[int]):
+        self.metrics = metrics
+        self.max_states = max_states
+        self.popped = self.pruned = self.high_water = 0
+
+    def pop(self, queue_size: int):
+        self.popped += 1
+        self.high_water = max(self.high_water, queue_size)
+        if self.max_states is not None and self.popped > self.max_states:
+            raise SearchLimitExceeded(f"Gave up after {self.max_states} states")
+
+    def report(self):
+        if self.metrics is not None:
+            METRICS.count(f"{self.metrics}.popped", self.popped)
+            METRICS.count(f"{self.metrics}.pruned", self.pruned)
+            METRICS.high_water(f"{self.metrics}.queue_high_water", self.high_water)
+
+
+def bfs(
+    starts: Iterable[S],
+    successors: Callable[[S], Iterable[S]],
+    key: Key = _identity,
+    is_goal: Optional[Callable[[S], bool]] = None,
+    max_states: Optional[int] = None,
+    metrics: Optional[str] = None,
+) -> SearchResult:
+    """Breadth-first search where every step costs 1. Without is_goal it runs until everything reachable is settled."""
+    tally = _Tally(metrics, max_states)
+    distances: Dict[Hashable, int] = {}
+    queue: Deque[Tuple[S, int]] = deque()
+    for start in starts:
+        if (start_key := key(start)) not in distances:
+            distances[start_key] = 0
+            queue.append((start, 0))
+    try:
+        while queue:
+            tally.pop(len(queue))
+            state, cost = queue.popleft()
+            if is_goal is not None and is_goal(state):
+                return SearchResult(state, cost, distances)
+            for next_state in successors(state):
+                # Marking states as they're queued rather than popped, so nothing is ever queued twice
+                if (next_key := key(next_state)) in distances:
+                    tally.pruned += 1
+                    continue
+                distances[next_key] = cost + 1
+                queue.append((next_state, cost + 1))
+        return SearchResult(None, None, distances)
+    finally:
+        tally.report()
+
+
+def astar(
+    starts: Iterable[S],
+    successors: Callable[[S], Iterable[Tuple[S, int]]],
+    heuristic: Callable[[S], int],
+    key: Key = _identity,
+    is_goal: Optional[Callable[[S], bool]] = None,
+    max_states: Optional[int] = None,
+    metrics: Optional[str] = None,
+) -> SearchResult:
+    """Best-first search over weighted steps (successors yields (state, step_cost) pairs).
+
+    heuristic must never overestimate the remaining cost, or the goal it finds may not be the cheapest.
+    """
+    tally = _Tally(metrics, max_states)
+    best: Dict[Hashable, int] = {}
+    settled: Dict[Hashable, int] = {}
+    # The counter breaks ties, so states themselves never need to be comparable
+    tiebreak = itertools.count()
+    queue: List[Tuple[int, int, int, S]] = []
+    for start in starts:
+        start_key = key(start)
+        if start_key not in best:
+            best[start_key] = 0
+            heapq.heappush(queue, (heuristic(start), next(tiebreak), 0, start))
+    try:
+        while queue:
+            tally.pop(len(queue))
+            _, _, cost, state = heapq.heappop(queue)
+            state_key = key(state)
+            # Stale entry, a cheaper way here was already settled
+            if state_key in settled:
+                tally.pruned += 1
+                continue
+            settled[state_key] = cost
+            if is_goal is not None and is_goal(state):
+                return SearchResult(state, cost, settled)
+            for next_state, step_cost in successors(state):
+                next_key = key(next_state)
+                next_cost = cost + step_cost
+                if next_key in settled or next_cost >= best.get(next_key, next_cost + 1):
+                    tally.pruned += 1
+                    continue
+                best[next_key] = next_cost
+                heapq.heappush(queue, (next_cost + heuristic(next_state), next(tiebreak), next_cost, next_state))
+        return SearchResult(None, None, settled)
+    finally:
+        tally.report()
+
+
+def dijkstra(
+    starts: Iterable[S],
+    successors: Callable[[S], Iterable[Tuple[S, int]]],
+    key: Key = _identity,
+    is_goal: Optional[Callable[[S], bool]] = None,
+    max_states: Optional[int] = None,
+    metrics: Optional[str] = None,
+) -> SearchResult:
+    return astar(starts, successors, lambda _: 0, key, is_goal, max_states, metrics)
+
+
+def explore(
+    starts: Iterable[S],
+    successors: Callable[[S], Iterable[S]],
+    key: Optional[Key] = _identity,
+    max_states: Optional[int] = None,
+    metrics: Optional[str] = None,
+) -> Iterator[S]:
+    """Yields every state reachable from starts, depth first, once per key.
+
+    Pass key=None to skip visited tracking when every path leads to a distinct state anyway.
+    """
+    tally = _Tally(metrics, max_states)
+    seen = set()
+    stack: List[S] = list(starts)
+    try:
+        while stack:
+            tally.pop(len(stack))
+            state = stack.pop()
+            if key is not None:
+                if (state_key := key(state)) in seen:
+                    tally.pruned += 1
+                    continue
+                seen.add(state_key)
+            yield state
+            stack.extend(successors(state))
+    finally:
+        tally.report()
+
+
+def branch_and_bound(
+    starts: Iterable[S],
+    successors: Callable[[S], Iterable[S]],
+    value: Callable[[S], int],
+    bound: Callable[[S], int],
+    key: Optional[Key] = _identity,
+    max_states: Optional[int] = None,
+    metrics: Optional[str] = None,
+) -> BestFound:
+    """Depth-first search for the state with the highest value.
+
+    bound(state) must be at least the value of anything reachable from state. Branches whose bound can't beat the best
+    value found so far are skipped, so good successors should come first. As with explore(), key=None turns off
+    visited tracking.
+    """
+    tally = _Tally(metrics, max_states)
+    seen = set()
+    stack: List[S] = list(starts)
+    best = BestFound(None, 0)
+    try:
+        while stack:
+            tally.pop(len(stack))
+            state = stack.pop()
+            if best.state is None or value(state) > best.value:
+                best = BestFound(state, value(state))
+            if bound(state) <= best.value:
+                tally.pruned += 1
+                continue
+            if key is not None:
+                if (state_key := key(state)) in seen:
+                    tally.pruned += 1
+                    continue
+                seen.add(state_key)
+            # Reversed so the first successor is the first one explored
+            stack.extend(reversed(list(successors(state))))
+        return best
+    finally:
+        tally.report()
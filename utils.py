@@ -1,14 +1,549 @@
+from __future__ import annotations
+from collections import defaultdict, OrderedDict
+from contextlib import contextmanager, nullcontext
+from functools import update_wrapper
 from pathlib import Path
-from typing import NamedTuple, Iterator
-from typing_extensions import Self
-import inspect
+from typing import (
+    NamedTuple, Iterator, Iterable, Dict, DefaultDict, ContextManager, Optional, Tuple, Mapping, Set, Any, Type,
+    List, Callable, Hashable, Union, TYPE_CHECKING,
+)
+import bisect
+import math
+import mmap
+import re
+import sys
+import time
+import types
+
+
+class LazyModule(types.ModuleType):
+    """Stands in for a module that only gets imported the first time one of its attributes is looked up."""
+
+    def __getattr__(self, name: str) -> Any:
+        import importlib
+        module = importlib.import_module(self.__name__)
+        # From here on lookups find the real attributes directly instead of coming back through here
+        self.__dict__.update(module.__dict__)
+        return getattr(module, name)
+
+
+if TYPE_CHECKING:
+    # Self is only used in annotations, and importing typing_extensions costs more than the rest of this module
+    from typing_extensions import Self
+    import numpy as np
+else:
+    # numpy takes longer to import than everything else the days use put together, so Grid, CoordArray,
+    # parse_ints and the days built on them share this and only pay for it once one of them actually runs
+    np = LazyModule("numpy")
+
+
+# Text to hand back instead of a day's input file (e.g. a generated input), keyed by the day's module name
+INPUT_OVERRIDES: Dict[str, str] = {}
+
+
+# Packed inputs (see inputstore.py) to read a day's input from when it has no file of its own in inputs/
+INPUT_STORE = Path("inputs/inputs.pack")
+
+
+# Inputs already read in this process, along with the (mtime, size) they were read at
+_BYTES_CACHE: Dict[str, Tuple[Tuple[int, int], bytes]] = {}
+_TEXT_CACHE: Dict[str, Tuple[Tuple[int, int], str]] = {}
+
+
+def day_module(day: int) -> str:
+    return f"advent2022_day{day:02}"
+
+
+def input_path(module_name: str) -> Path:
+    return Path(f"inputs/{module_name}_input.txt")
+
+
+def _file_version(path: Path) -> Tuple[int, int]:
+    # Checking this keeps long-running processes from handing back an input that's since been replaced
+    stat = path.stat()
+    return stat.st_mtime_ns, stat.st_size
+
+
+def decode_input(data: bytes) -> str:
+    # Normalise newlines the same way read_text() does, since the inputs were saved with CRLF
+    return data.decode().replace("\r\n", "\n").replace("\r", "\n")
+
+
+def _stored_input(day: int, path: Path):
+    """The packed store to read a day's input from instead, if it has none in inputs/ but the store has one.
+
+    A file in inputs/ always wins, so a freshly fetched input isn't hidden behind an older store.
+    """
+    if path.exists() or not INPUT_STORE.exists():
+        return None
+    from inputstore import open_store, DEFAULT_ID
+    store = open_store(INPUT_STORE)
+    return store if (day, DEFAULT_ID) in store else None
+
+
+def load_bytes(day: int) -> bytes:
+    module_name = day_module(day)
+    if module_name in INPUT_OVERRIDES:
+        return INPUT_OVERRIDES[module_name].encode()
+    path = input_path(module_name)
+    if (store := _stored_input(day, path)) is not None:
+        return store.read_bytes(day)
+    version = _file_version(path)
+    cached = _BYTES_CACHE.get(module_name)
+    if cached is None or cached[0] != version:
+        cached = _BYTES_CACHE[module_name] = (version, path.read_bytes())
+    return cached[1]
+
+
+def load_text(day: int) -> str:
+    module_name = day_module(day)
+    if module_name in INPUT_OVERRIDES:
+        return INPUT_OVERRIDES[module_name]
+    path = input_path(module_name)
+    if (store := _stored_input(day, path)) is not None:
+        return store.read_text(day)
+    version = _file_version(path)
+    cached = _TEXT_CACHE.get(module_name)
+    if cached is None or cached[0] != version:
+        cached = _TEXT_CACHE[module_name] = (version, decode_input(path.read_bytes()))
+    return cached[1]
+
+
+def load_lines(day: int) -> Iterator[str]:
+    # Streams the file a line at a time rather than reading it all in
+    module_name = day_module(day)
+    if module_name in INPUT_OVERRIDES:
+        yield from INPUT_OVERRIDES[module_name].splitlines()
+        return
+    path = input_path(module_name)
+    if (store := _stored_input(day, path)) is not None:
+        yield from store.read_text(day).splitlines()
+        return
+    with path.open() as input_file:
+        yield from (line.rstrip("\n") for line in input_file)
+
+
+def load_mmap(day: int) -> mmap.mmap:
+    module_name = day_module(day)
+    path = input_path(module_name)
+    if module_name in INPUT_OVERRIDES or _stored_input(day, path) is not None:
+        # Neither has a file of its own to map, so copy it into an anonymous map to keep the interface the same
+        data = load_bytes(day)
+        mapped = mmap.mmap(-1, max(len(data), 1))
+        mapped.write(data)
+        mapped.seek(0)
+        return mapped
+    with path.open("rb") as input_file:
+        return mmap.mmap(input_file.fileno(), 0, access=mmap.ACCESS_READ)
 
 
 # Grab my input data from the automatically-named file generated by get_data.py
-def read_data():
-    caller_filename = inspect.stack()[1].filename
-    filename = Path(f"inputs/{Path(caller_filename).stem}_input.txt")
-    return filename.read_text()
+def read_data(day: Optional[int] = None) -> str:
+    if day is None:
+        # Fall back to working out the day from the caller's filename
+        caller = Path(sys._getframe(1).f_code.co_filename).stem
+        day = int(caller.rsplit("day", 1)[1])
+    return load_text(day)
+
+
+# Byte translations that blank out everything that can't be part of a number, so np.fromstring can read the rest
+_NUMBER_BYTES = b"0123456789"
+_UNSIGNED_INTS = bytes.maketrans(
+    bytes(x for x in range(256) if x not in _NUMBER_BYTES), b" " * (256 - len(_NUMBER_BYTES))
+)
+_SIGNED_INTS = bytes.maketrans(
+    bytes(x for x in range(256) if x not in _NUMBER_BYTES + b"-"), b" " * (255 - len(_NUMBER_BYTES))
+)
+# A "-" is only a sign when a digit follows it and none comes before it, so "2-4" is still two numbers
+_NOT_A_SIGN = re.compile(rb"-(?:(?!\d)|(?<=\d-))")
+
+
+def parse_ints(text: Union[str, bytes], signed: bool = True, fields: Optional[int] = None) -> np.ndarray:
+    """Every integer in text, in order, as one int64 array, optionally reshaped into rows of fields values each.
+
+    The whole input gets scanned in a couple of C-level passes rather than a regex and an int() per match.
+    signed=False skips looking for minus signs, for inputs that only use "-" as a separator.
+
+    >>> parse_ints("Sensor at x=-3, y=12").tolist()
+    [-3, 12]
+    >>> parse_ints("2-4,6-8", signed=False, fields=2).tolist()
+    [[2, 4], [6, 8]]
+    >>> parse_ints("no numbers here - at all").tolist()
+    []
+    """
+    data = text.encode() if isinstance(text, str) else text
+    if signed:
+        data = data.translate(_SIGNED_INTS)
+        if b"-" in data:
+            data = _NOT_A_SIGN.sub(b" ", data)
+    else:
+        data = data.translate(_UNSIGNED_INTS)
+    if data.strip():
+        values = np.fromstring(data, dtype=np.int64, sep=" ")
+    else:
+        # fromstring reads a buffer with no numbers in it as a single 0
+        values = np.zeros(0, dtype=np.int64)
+    if fields is None:
+        return values
+    if len(values) % fields:
+        raise ValueError(f"Found {len(values)} ints, which doesn't split into records of {fields}")
+    return values.reshape(-1, fields)
+
+
+# How many processes parallel_map/parallel_first may use, where None means one per CPU. alldays.py sets this to 1
+# while profiling or measuring, since those only see the current process.
+PARALLEL_WORKERS: Optional[int] = None
+
+
+def _pool_size(workers: Optional[int], items: int) -> int:
+    import multiprocessing
+    import os
+    # Inside a worker already (alldays.py --parallel, batch.py), the other cores are spoken for
+    if multiprocessing.parent_process() is not None:
+        return 1
+    if workers is None:
+        workers = PARALLEL_WORKERS or os.cpu_count() or 1
+    return min(workers, items)
+
+
+def parallel_map(
+    func: Callable[[Any], Any], items: Iterable[Any], workers: Optional[int] = None, chunksize: int = 1
+) -> List[Any]:
+    """func(item) for every item, in order, spread over a process pool (func and the items need to pickle).
+
+    Runs serially in this process when there's only one worker to use, so there's no pool overhead on one core.
+    """
+    items = list(items)
+    workers = _pool_size(workers, len(items))
+    if workers <= 1:
+        return [func(x) for x in items]
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(func, items, chunksize=chunksize))
+
+
+def parallel_first(
+    func: Callable[[Any], Any],
+    items: Iterable[Any],
+    predicate: Callable[[Any], bool] = bool,
+    workers: Optional[int] = None,
+    chunksize: int = 1,
+) -> Any:
+    """The first result, in item order, that passes predicate (truthy by default), or None if none do.
+
+    Like next() over parallel_map, except that work still queued once a match turns up is cancelled.
+    """
+    items = list(items)
+    workers = _pool_size(workers, len(items))
+    if workers <= 1:
+        return next((x for x in map(func, items) if predicate(x)), None)
+    from concurrent.futures import ProcessPoolExecutor
+    executor = ProcessPoolExecutor(max_workers=workers)
+    try:
+        return next((x for x in executor.map(func, items, chunksize=chunksize) if predicate(x)), None)
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+
+class Metrics:
+    """Named counters, gauges and section timers for instrumenting solvers.
+
+    Everything is a no-op until enabled, so solvers can report unconditionally. Hot loops should
+    tally into locals and report once per call rather than calling in here per iteration.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.counters: DefaultDict[str, int] = defaultdict(int)
+        self.gauges: Dict[str, float] = {}
+        self.timers: DefaultDict[str, float] = defaultdict(float)
+
+    def count(self, name: str, amount: int = 1):
+        if self.enabled:
+            self.counters[name] += amount
+
+    def gauge(self, name: str, value: float):
+        if self.enabled:
+            self.gauges[name] = value
+
+    def high_water(self, name: str, value: float):
+        if self.enabled:
+            self.gauges[name] = max(self.gauges.get(name, value), value)
+
+    def timer(self, name: str) -> ContextManager:
+        return self._timer(name) if self.enabled else nullcontext()
+
+    @contextmanager
+    def _timer(self, name: str):
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.timers[name] += (time.perf_counter_ns() - start) / 1e9
+
+    def reset(self):
+        self.counters.clear()
+        self.gauges.clear()
+        self.timers.clear()
+
+    def snapshot(self) -> Dict[str, float]:
+        return {**self.counters, **self.gauges, **{f"{k} (s)": v for k, v in self.timers.items()}}
+
+
+METRICS = Metrics()
+
+
+class Phases:
+    """Wall time per phase of a solve (parse, part one, part two) in nanoseconds, for the runner to report.
+
+    Unlike Metrics this is always on, since it's only a couple of timestamps per phase.
+    """
+
+    def __init__(self):
+        self.elapsed_ns: Dict[str, int] = {}
+
+    @contextmanager
+    def phase(self, name: str):
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.elapsed_ns[name] = self.elapsed_ns.get(name, 0) + time.perf_counter_ns() - start
+
+    def reset(self):
+        self.elapsed_ns.clear()
+
+    def snapshot(self) -> Dict[str, int]:
+        return dict(self.elapsed_ns)
+
+
+PHASES = Phases()
+
+
+class Memoized:
+    """A function wrapped by memoize(), with its cache and counts of how well the cache is doing."""
+
+    def __init__(self, func: Callable, maxsize: Optional[int], key: Optional[Callable[..., Hashable]]):
+        update_wrapper(self, func)
+        self.func = func
+        self.maxsize = maxsize
+        self.key = key
+        self.cache: OrderedDict[Hashable, Any] = OrderedDict()
+        self.hits = self.misses = self.evictions = 0
+
+    def __call__(self, *args, **kwargs):
+        if self.key is not None:
+            cache_key = self.key(*args, **kwargs)
+        else:
+            cache_key = (args, frozenset(kwargs.items())) if kwargs else args
+        try:
+            result = self.cache[cache_key]
+        except KeyError:
+            pass
+        else:
+            self.hits += 1
+            if self.maxsize is not None:
+                self.cache.move_to_end(cache_key)
+            return result
+        self.misses += 1
+        result = self.cache[cache_key] = self.func(*args, **kwargs)
+        if self.maxsize is not None and len(self.cache) > self.maxsize:
+            self.cache.popitem(last=False)
+            self.evictions += 1
+        return result
+
+    def __get__(self, instance: Any, owner: Type) -> Callable:
+        # So methods can be memoized too, with the instance passed on to func (and key) like any other argument
+        return self if instance is None else types.MethodType(self, instance)
+
+    def clear(self):
+        self.cache.clear()
+        self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> Dict[str, float]:
+        calls = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self.cache),
+            "hit_rate": self.hits / calls if calls else 0.0,
+        }
+
+
+# Every memoized function, by module and name, so the runner can clear them between days and report on them
+MEMOIZED: Dict[str, Memoized] = {}
+
+
+def memoize(
+    maxsize: Optional[int] = 1024, key: Optional[Callable[..., Hashable]] = None
+) -> Callable[[Callable], Memoized]:
+    """Cache a pure function's results, evicting the least recently used once there are more than maxsize.
+
+    By default the arguments themselves are the cache key, so they need to be hashable. Otherwise key is called with
+    the same arguments and returns something hashable to stand in for them (e.g. a tuple of the parts that matter).
+    maxsize=None never evicts.
+    """
+    def decorator(func: Callable) -> Memoized:
+        memoized = Memoized(func, maxsize, key)
+        MEMOIZED[f"{func.__module__}.{func.__qualname__}"] = memoized
+        return memoized
+    return decorator
+
+
+def clear_memos():
+    for memoized in MEMOIZED.values():
+        memoized.clear()
+
+
+def memo_stats() -> Dict[str, float]:
+    # Only the ones that actually got called, so each day just reports its own
+    return {
+        f"memo.{name}.{stat}": value
+        for name, memoized in MEMOIZED.items() if memoized.hits or memoized.misses
+        for stat, value in memoized.stats().items()
+    }
+
+
+class Cycle(NamedTuple):
+    # Steps taken before the simulation settles into its loop, and how many steps the loop takes
+    offset: int
+    period: int
+    # value() after every step, from the starting state up to and including the first repeat
+    values: List[Any]
+
+    @property
+    def deltas(self) -> List[Any]:
+        """How much the value changes on each step of the loop."""
+        return [self.values[i + 1] - self.values[i] for i in range(self.offset, self.offset + self.period)]
+
+    def fast_forward(self, step: int) -> Tuple[int, int]:
+        """Maps step to the earliest step in the same phase of the loop, along with how many loops apart they are."""
+        if step < len(self.values):
+            return step, 0
+        loops, phase = divmod(step - self.offset, self.period)
+        return self.offset + phase, loops
+
+    def value_at(self, step: int) -> Any:
+        """The value after any number of steps. Values can be numbers or tuples of numbers."""
+        earlier, loops = self.fast_forward(step)
+        value, start, end = self.values[earlier], self.values[self.offset], self.values[self.offset + self.period]
+        if isinstance(value, tuple):
+            return tuple(v + loops * (e - s) for v, s, e in zip(value, start, end))
+        return value + loops * (end - start)
+
+
+def find_cycle(
+    state: Any,
+    step: Callable[[Any], Any],
+    key: Callable[[Any], Hashable],
+    value: Callable[[Any], Any],
+    max_steps: Optional[int] = None,
+) -> Cycle:
+    """Runs step() until key() repeats, to find where a simulation starts looping.
+
+    This is exact rather than a guess, provided key(state) pins down everything that affects later steps and how value
+    changes. Steps may update state in place, since only keys and values are kept.
+    """
+    seen: Dict[Hashable, int] = {}
+    values = []
+    i = 0
+    while True:
+        state_key = key(state)
+        values.append(value(state))
+        if state_key in seen:
+            return Cycle(seen[state_key], i - seen[state_key], values)
+        seen[state_key] = i
+        if max_steps is not None and i >= max_steps:
+            raise ValueError(f"No cycle within {max_steps} steps")
+        state = step(state)
+        i += 1
+
+
+class IntervalSet:
+    """A set of ints stored as sorted, disjoint [start, stop) intervals, i.e. a merged list of ranges.
+
+    Intervals that touch are merged as well as ones that overlap, so there's always a gap between neighbors. Lookups
+    are binary searches over the starts and stops.
+    """
+
+    def __init__(self, ranges: Iterable[range] = ()):
+        self.starts: List[int] = []
+        self.stops: List[int] = []
+        for x in ranges:
+            self.add(x.start, x.stop)
+
+    def add(self, start: int, stop: int):
+        if start >= stop:
+            return
+        # Everything from the first interval that reaches start to the last one that begins by stop merges in
+        first = bisect.bisect_left(self.stops, start)
+        last = bisect.bisect_right(self.starts, stop)
+        if first < last:
+            start, stop = min(start, self.starts[first]), max(stop, self.stops[last - 1])
+        self.starts[first:last] = [start]
+        self.stops[first:last] = [stop]
+
+    @property
+    def length(self) -> int:
+        """How many ints are covered."""
+        return sum(self.stops) - sum(self.starts)
+
+    def covers(self, start: int, stop: int) -> bool:
+        """Whether every int in [start, stop) is in the set."""
+        i = bisect.bisect_right(self.starts, start) - 1
+        return start >= stop or (i >= 0 and stop <= self.stops[i])
+
+    def overlaps(self, start: int, stop: int) -> bool:
+        """Whether any int in [start, stop) is in the set."""
+        i = bisect.bisect_right(self.stops, start)
+        return start < stop and i < len(self.starts) and self.starts[i] < stop
+
+    def gaps(self, start: int, stop: int) -> IntervalSet:
+        """The ints in [start, stop) that aren't in the set."""
+        gaps = IntervalSet()
+        current = start
+        i = bisect.bisect_right(self.stops, start)
+        while i < len(self.starts) and self.starts[i] < stop:
+            gaps.add(current, self.starts[i])
+            current = max(current, self.stops[i])
+            i += 1
+        gaps.add(current, stop)
+        return gaps
+
+    def __contains__(self, value: int) -> bool:
+        i = bisect.bisect_right(self.starts, value) - 1
+        return i >= 0 and value < self.stops[i]
+
+    def __iter__(self) -> Iterator[range]:
+        return (range(start, stop) for start, stop in zip(self.starts, self.stops))
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, IntervalSet) and self.starts == other.starts and self.stops == other.stops
+
+    def __or__(self, other: IntervalSet) -> IntervalSet:
+        union = IntervalSet(self)
+        for x in other:
+            union.add(x.start, x.stop)
+        return union
+
+    def __and__(self, other: IntervalSet) -> IntervalSet:
+        intersection = IntervalSet()
+        i = j = 0
+        # Walk both lists together, always moving past whichever interval ends first
+        while i < len(self.starts) and j < len(other.starts):
+            intersection.add(max(self.starts[i], other.starts[j]), min(self.stops[i], other.stops[j]))
+            if self.stops[i] < other.stops[j]:
+                i += 1
+            else:
+                j += 1
+        return intersection
+
+    def __repr__(self) -> str:
+        return f"IntervalSet({list(self)})"
 
 
 class BaseCoord(NamedTuple):
@@ -76,3 +611,308 @@ ALL_NEIGHBORS_3D = tuple(
 )
 CARDINAL_NEIGHBORS_2D = tuple(x for x in ALL_NEIGHBORS_2D if not (abs(x.x) == abs(x.y)))
 CARDINAL_NEIGHBORS_3D = tuple(x for x in ALL_NEIGHBORS_3D if abs(x.x) + abs(x.y) + abs(x.z) == 1)
+
+
+# CoordSet packs each coord into one int, treating its fields as digits in base COORD_STRIDE (first field most
+# significant), so every field has to stay within +/- COORD_STRIDE // 2. Packing is linear, so pack(a) + pack(b) ==
+# pack(a + b), which lets hot loops step between neighbors with int additions instead of building coords.
+COORD_STRIDE = 2**24
+_COORD_HALF = COORD_STRIDE // 2
+
+
+def pack(coord: Tuple[int, ...]) -> int:
+    key = 0
+    for value in coord:
+        key = key * COORD_STRIDE + value
+    return key
+
+
+def unpack(key: int, coord_type: Type[Tuple[int, ...]] = BaseCoord) -> Any:
+    values = []
+    for _ in coord_type._fields:
+        key, value = divmod(key + _COORD_HALF, COORD_STRIDE)
+        values.append(value - _COORD_HALF)
+    return coord_type(*reversed(values))
+
+
+class CoordSet:
+    """A set of coords stored as packed ints, for sparse or unbounded maps that would otherwise be a Set[BaseCoord].
+
+    The coord-level methods pack on the way in and unpack on the way out. Hot loops should work on .keys directly,
+    using pack() on neighbor offsets once up front.
+    """
+
+    def __init__(self, coords: Iterable[Tuple[int, ...]] = (), coord_type: Type[Tuple[int, ...]] = BaseCoord):
+        self.keys: Set[int] = {pack(x) for x in coords}
+        self.coord_type = coord_type
+
+    @classmethod
+    def from_keys(cls, keys: Iterable[int], coord_type: Type[Tuple[int, ...]] = BaseCoord) -> Self:
+        coord_set = cls(coord_type=coord_type)
+        coord_set.keys = set(keys)
+        return coord_set
+
+    def add(self, coord: Tuple[int, ...]):
+        self.keys.add(pack(coord))
+
+    def discard(self, coord: Tuple[int, ...]):
+        self.keys.discard(pack(coord))
+
+    def update(self, coords: Iterable[Tuple[int, ...]]):
+        self.keys.update(pack(x) for x in coords)
+
+    def neighbor_count(self, coord: Tuple[int, ...], neighbors: Iterable[Tuple[int, ...]] = ALL_NEIGHBORS_2D) -> int:
+        key = pack(coord)
+        return sum(key + pack(x) in self.keys for x in neighbors)
+
+    def copy(self) -> Self:
+        return self.from_keys(self.keys, self.coord_type)
+
+    def __contains__(self, coord: Tuple[int, ...]) -> bool:
+        return pack(coord) in self.keys
+
+    def __iter__(self) -> Iterator[Any]:
+        return (unpack(x, self.coord_type) for x in self.keys)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, CoordSet) and self.keys == other.keys
+
+    def __or__(self, other: CoordSet) -> Self:
+        return self.from_keys(self.keys | other.keys, self.coord_type)
+
+    def __and__(self, other: CoordSet) -> Self:
+        return self.from_keys(self.keys & other.keys, self.coord_type)
+
+    def __sub__(self, other: CoordSet) -> Self:
+        return self.from_keys(self.keys - other.keys, self.coord_type)
+
+
+def shift_cells(cells: np.ndarray, offset: BaseCoord, fill: Any = 0) -> np.ndarray:
+    """Returns an array where [y, x] holds cells[y + offset.y, x + offset.x], and fill wherever that's off the edge."""
+    shifted = np.full_like(cells, fill)
+    height, width = cells.shape
+    dy, dx = offset.y, offset.x
+    if abs(dy) >= height or abs(dx) >= width:
+        return shifted
+    shifted[max(-dy, 0):height - max(dy, 0), max(-dx, 0):width - max(dx, 0)] = \
+        cells[max(dy, 0):height + min(dy, 0), max(dx, 0):width + min(dx, 0)]
+    return shifted
+
+
+class Grid:
+    """A bounded 2D map stored densely in a numpy array, for days that would otherwise use a Dict[BaseCoord, ...].
+
+    cells is indexed [y, x] like BaseCoord, relative to origin (so maps can reach into negative coords). Reading
+    outside the array gives fill, the same way the dict versions use .get().
+    """
+
+    def __init__(self, cells: np.ndarray, origin: BaseCoord = BaseCoord(y=0, x=0), fill: Any = 0):
+        self.cells = cells
+        self.origin = origin
+        self.fill = fill
+
+    @classmethod
+    def from_text(cls, raw_input: str, mapping: Optional[Mapping[str, Any]] = None, fill: Any = 0,
+                  dtype: Any = None) -> Self:
+        """One cell per character. Without a mapping the cells are the characters themselves."""
+        lines = raw_input.splitlines()
+        width = max(len(x) for x in lines)
+        if mapping is None:
+            return cls(np.array([list(x.ljust(width)) for x in lines]), fill=" ")
+        rows = [[mapping.get(c, fill) for c in x.ljust(width)] for x in lines]
+        return cls(np.array(rows, dtype=dtype), fill=fill)
+
+    @classmethod
+    def from_dict(cls, cells: Mapping[BaseCoord, Any], fill: Any = 0, dtype: Any = None) -> Self:
+        if not cells:
+            return cls(np.empty((0, 0), dtype=dtype), fill=fill)
+        ys = np.fromiter((c.y for c in cells), dtype=np.int64, count=len(cells))
+        xs = np.fromiter((c.x for c in cells), dtype=np.int64, count=len(cells))
+        origin = BaseCoord(y=int(ys.min()), x=int(xs.min()))
+        values = np.array(list(cells.values()), dtype=dtype)
+        array = np.full((int(ys.max()) - origin.y + 1, int(xs.max()) - origin.x + 1), fill, dtype=values.dtype)
+        array[ys - origin.y, xs - origin.x] = values
+        return cls(array, origin, fill)
+
+    @classmethod
+    def from_coords(cls, coords: Iterable[BaseCoord]) -> Self:
+        """A boolean grid, the dense form of a Set[BaseCoord]."""
+        return cls.from_dict(dict.fromkeys(coords, True), fill=False, dtype=bool)
+
+    def to_dict(self, include_fill: bool = True) -> Dict[BaseCoord, Any]:
+        mask = None if include_fill else self.cells != self.fill
+        return {c: self[c] for c in self.coords(mask)}
+
+    def to_set(self) -> Set[BaseCoord]:
+        return set(self.coords(self.cells.astype(bool)))
+
+    @property
+    def height(self) -> int:
+        return self.cells.shape[0]
+
+    @property
+    def width(self) -> int:
+        return self.cells.shape[1]
+
+    def coords(self, mask: Optional[np.ndarray] = None) -> Iterator[BaseCoord]:
+        """Every coord in the grid, or only those where mask (an array the same shape as cells) is true."""
+        if mask is None:
+            mask = np.ones(self.cells.shape, dtype=bool)
+        for y, x in zip(*np.nonzero(mask)):
+            yield BaseCoord(y=int(y) + self.origin.y, x=int(x) + self.origin.x)
+
+    def in_bounds(self, coord: BaseCoord) -> bool:
+        return 0 <= coord.y - self.origin.y < self.height and 0 <= coord.x - self.origin.x < self.width
+
+    def __contains__(self, coord: BaseCoord) -> bool:
+        # Same as for the Set/Dict versions: only cells that hold something other than fill are in the grid
+        return self[coord] != self.fill
+
+    def __getitem__(self, coord: BaseCoord) -> Any:
+        if not self.in_bounds(coord):
+            return self.fill
+        return self.cells[coord.y - self.origin.y, coord.x - self.origin.x].item()
+
+    def __setitem__(self, coord: BaseCoord, value: Any):
+        if not self.in_bounds(coord):
+            raise IndexError(f"{coord} is outside the grid, pad() it first")
+        self.cells[coord.y - self.origin.y, coord.x - self.origin.x] = value
+
+    def shift(self, offset: BaseCoord) -> np.ndarray:
+        """For each cell, the value of the cell at +offset from it (see shift_cells)."""
+        return shift_cells(self.cells, offset, self.fill)
+
+    def neighbor_count(self, neighbors: Iterable[BaseCoord] = ALL_NEIGHBORS_2D) -> np.ndarray:
+        """For each cell, how many of its neighbors are truthy."""
+        truthy = self.cells.astype(bool)
+        counts = np.zeros(self.cells.shape, dtype=np.int8)
+        for offset in neighbors:
+            counts += shift_cells(truthy, offset, False)
+        return counts
+
+    def pad(self, amount: int = 1) -> Self:
+        return self.__class__(
+            np.pad(self.cells, amount, constant_values=self.fill),
+            self.origin - BaseCoord(y=amount, x=amount),
+            self.fill,
+        )
+
+    def trim(self) -> Self:
+        """Crops to the bounding box of every cell that isn't fill."""
+        ys, xs = np.nonzero(self.cells != self.fill)
+        if len(ys) == 0:
+            return self.__class__(self.cells[:0, :0], self.origin, self.fill)
+        return self.__class__(
+            self.cells[ys.min():ys.max() + 1, xs.min():xs.max() + 1],
+            self.origin + BaseCoord(y=int(ys.min()), x=int(xs.min())),
+            self.fill,
+        )
+
+    def copy(self) -> Self:
+        return self.__class__(self.cells.copy(), self.origin, self.fill)
+
+
+class CoordArray:
+    """A batch of coords as one (n, dims) int64 array, for doing the same coord math to many points at once.
+
+    Columns follow coord_type's fields, so (y, x) for BaseCoord and (y, x, z) for BaseCoord3D. Arithmetic takes
+    either another CoordArray of the same length or a single coord, which is broadcast to every row.
+    """
+
+    def __init__(self, values: np.ndarray, coord_type: Type[Tuple[int, ...]] = BaseCoord):
+        self.values = values
+        self.coord_type = coord_type
+
+    @classmethod
+    def from_coords(cls, coords: Iterable[Tuple[int, ...]], coord_type: Type[Tuple[int, ...]] = BaseCoord) -> Self:
+        values = np.array(list(coords), dtype=np.int64).reshape(-1, len(coord_type._fields))
+        return cls(values, coord_type)
+
+    def _wrap(self, values: np.ndarray) -> Self:
+        return self.__class__(values, self.coord_type)
+
+    @staticmethod
+    def _operand(other: Any) -> Any:
+        return other.values if isinstance(other, CoordArray) else tuple(other)
+
+    def column(self, field: str) -> np.ndarray:
+        return self.values[:, self.coord_type._fields.index(field)]
+
+    @property
+    def y(self) -> np.ndarray:
+        return self.column("y")
+
+    @property
+    def x(self) -> np.ndarray:
+        return self.column("x")
+
+    @property
+    def z(self) -> np.ndarray:
+        return self.column("z")
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __iter__(self) -> Iterator[Any]:
+        return (self.coord_type(*(int(x) for x in row)) for row in self.values)
+
+    def __getitem__(self, index: Any) -> Self:
+        return self._wrap(self.values[index])
+
+    def __add__(self, other: Any) -> Self:
+        return self._wrap(self.values + self._operand(other))
+
+    def __sub__(self, other: Any) -> Self:
+        return self._wrap(self.values - self._operand(other))
+
+    def __mul__(self, amount: Any) -> Self:
+        # Per-row amounts come in as a 1D array, so line them up against the rows rather than the columns
+        if np.ndim(amount) != 0:
+            amount = amount[:, None]
+        return self._wrap(self.values * amount)
+
+    def distance(self, other: Any) -> np.ndarray:
+        return abs(self.values - self._operand(other)).sum(axis=1)
+
+    def _expand(self, offsets: Iterable[Tuple[int, ...]]) -> Self:
+        offset_array = np.array(list(offsets), dtype=np.int64)
+        return self._wrap((self.values[:, None, :] + offset_array[None, :, :]).reshape(-1, self.values.shape[1]))
+
+    def neighbors(self) -> Self:
+        """Every neighbor of every point, neighbors of the first point first. Points can repeat, see unique()."""
+        return self._expand(ALL_NEIGHBORS_2D if len(self.coord_type._fields) == 2 else ALL_NEIGHBORS_3D)
+
+    def cardinal_neighbors(self) -> Self:
+        return self._expand(CARDINAL_NEIGHBORS_2D if len(self.coord_type._fields) == 2 else CARDINAL_NEIGHBORS_3D)
+
+    def unique(self) -> Self:
+        return self._wrap(np.unique(self.values, axis=0))
+
+    def concat(self, other: CoordArray) -> Self:
+        return self._wrap(np.concatenate([self.values, other.values]))
+
+    def bounds(self) -> Tuple[Any, Any]:
+        """The smallest and largest value of each field, as a pair of coords."""
+        return (
+            self.coord_type(*(int(x) for x in self.values.min(axis=0))),
+            self.coord_type(*(int(x) for x in self.values.max(axis=0))),
+        )
+
+    def within(self, low: Tuple[int, ...], high: Tuple[int, ...]) -> np.ndarray:
+        """Which points lie inside the box from low to high, inclusive."""
+        return ((self.values >= tuple(low)) & (self.values <= tuple(high))).all(axis=1)
+
+    def isin(self, other: CoordArray) -> np.ndarray:
+        """Which of these points also appear in other."""
+        if len(self) == 0 or len(other) == 0:
+            return np.zeros(len(self), dtype=bool)
+        # Pack each row into one int over the bounding box of both arrays, so numpy can compare them as scalars
+        low = np.minimum(self.values.min(axis=0), other.values.min(axis=0))
+        spans = [int(x) + 1 for x in np.maximum(self.values.max(axis=0), other.values.max(axis=0)) - low]
+        if math.prod(spans) >= 2**63:
+            raise ValueError("Coords are too spread out to pack into int64")
+        strides = np.array([math.prod(spans[i + 1:]) for i in range(len(spans))], dtype=np.int64)
+        return np.isin((self.values - low) @ strides, (other.values - low) @ strides)